@@ -1,11 +1,19 @@
 # app.py
 import streamlit as st
 
+from model_registry import start_warmup
+from resume_tools import start_parse_sandbox
+
 st.set_page_config(
     page_title="AI Career Assistant",
     layout="wide",
     initial_sidebar_state="expanded",
 )
 
+# Warm MiniLM and spaCy (or WARM_MODELS) in the background, once per process
+start_warmup()
+# With RESUME_ISOLATED=1, spawn the parse sandbox's workers now rather than on the first upload
+start_parse_sandbox()
+
 # Redirect immediately to Home page
 st.switch_page("pages/Home.py")
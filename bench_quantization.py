@@ -0,0 +1,68 @@
+"""
+Compare float32 / float16 / int8 job index storage.
+
+    python bench_quantization.py                      # synthetic 384-d corpus
+    python bench_quantization.py --jobs jobs.json     # real MiniLM embeddings
+
+Reports memory, mean query time and top-k agreement with float32.
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from quantize import STORAGE_MODES
+
+def synthetic_corpus(n: int, dim: int, clusters: int = 50, seed: int = 0) -> np.ndarray:
+    # Clustered vectors resemble job embeddings better than isotropic noise
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    vecs = centers[rng.integers(0, clusters, n)] + 0.6 * rng.normal(size=(n, dim))
+    vecs /= np.linalg.norm(vecs, axis=1, keepdims=True)
+    return vecs.astype(np.float32)
+
+def job_corpus(path: str) -> np.ndarray:
+    import matcher
+    with open(path, "r", encoding="utf-8") as f:
+        jobs = json.load(f)
+    return matcher.encode_texts([matcher._job_text(j) for j in jobs])
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--jobs", help="JSON list of job dicts to embed instead of a synthetic corpus")
+    ap.add_argument("--n", type=int, default=20000)
+    ap.add_argument("--dim", type=int, default=384)
+    ap.add_argument("--queries", type=int, default=200)
+    ap.add_argument("--k", type=int, default=10)
+    args = ap.parse_args()
+
+    from job_index import JobIndex
+
+    vecs = job_corpus(args.jobs) if args.jobs else synthetic_corpus(args.n, args.dim)
+    rng = np.random.default_rng(1)
+    queries = vecs[rng.integers(0, len(vecs), args.queries)] + 0.3 * rng.normal(size=(args.queries, vecs.shape[1]))
+    ids = [str(i) for i in range(len(vecs))]
+    jobs = [{"id": i} for i in ids]
+
+    results = {}
+    for mode in STORAGE_MODES:
+        index = JobIndex(storage=mode)
+        index.add(jobs, embeddings=vecs, ids=ids)
+        index.query(queries[0], args.k)  # warm-up
+        t0 = time.perf_counter()
+        tops = [[job_id for job_id, _ in index.query(q, args.k)] for q in queries]
+        elapsed = (time.perf_counter() - t0) / len(queries)
+        results[mode] = (index.nbytes, elapsed, tops)
+
+    base_bytes, base_time, base_tops = results["float32"]
+    print(f"corpus: {len(vecs)} x {vecs.shape[1]}, {len(queries)} queries, top-{args.k}")
+    print(f"{'mode':<8} {'memory':>10} {'saved':>7} {'query ms':>9} {'speedup':>8} {'top-k agree':>12} {'top-1 agree':>12}")
+    for mode, (nbytes, elapsed, tops) in results.items():
+        overlap = np.mean([len(set(a) & set(b)) / args.k for a, b in zip(tops, base_tops)])
+        top1 = np.mean([a[0] == b[0] for a, b in zip(tops, base_tops)])
+        print(f"{mode:<8} {nbytes / 2**20:>8.1f}MB {1 - nbytes / base_bytes:>7.0%} {elapsed * 1e3:>9.2f} "
+              f"{base_time / elapsed:>7.2f}x {overlap:>12.3f} {top1:>12.3f}")
+
+if __name__ == "__main__":
+    main()
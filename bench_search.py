@@ -0,0 +1,79 @@
+"""
+Offline load test for the job search path.
+
+    # 1. record fixtures once (needs network / Adzuna keys)
+    python bench_search.py --record --source "All sources" --query python
+    # 2. replay them with injected latency and errors, no network needed
+    python bench_search.py --source "All sources" --query python \\
+        --requests 200 --concurrency 8 --latency-ms 300 --error-rate 0.05
+
+Reports throughput, latency percentiles and per-source breaker stats.
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import jobs_api
+from response_cache import ResponseCache
+from transport import RecordingTransport, ReplayTransport
+
+def _pct(data, q):
+    return data[min(len(data) - 1, int(q * len(data)))] * 1000.0 if data else float("nan")
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--fixtures", default="fixtures/http")
+    ap.add_argument("--record", action="store_true", help="hit the live APIs once and save fixtures")
+    ap.add_argument("--source", default="Arbeitnow")
+    ap.add_argument("--query", default="python")
+    ap.add_argument("--location", default="India")
+    ap.add_argument("--results", type=int, default=20)
+    ap.add_argument("--workable", default="", help="comma-separated Workable company slugs")
+    ap.add_argument("--requests", type=int, default=100)
+    ap.add_argument("--concurrency", type=int, default=4)
+    ap.add_argument("--latency-ms", type=float, default=0.0)
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    ap.add_argument("--timeout-rate", type=float, default=0.0)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    companies = [c.strip() for c in args.workable.split(",") if c.strip()]
+
+    def search():
+        return jobs_api.get_jobs(args.source, args.query, args.location, args.results, companies)
+
+    if args.record:
+        jobs_api.set_transport(RecordingTransport(args.fixtures))
+        print(f"recorded {len(search())} jobs into {args.fixtures}")
+        return
+
+    jobs_api.set_transport(ReplayTransport(
+        args.fixtures, latency_ms=args.latency_ms, error_rate=args.error_rate,
+        timeout_rate=args.timeout_rate, seed=args.seed,
+    ))
+    # Every request should exercise the transport, not the response cache
+    jobs_api.response_cache = ResponseCache(ttl=0, stale_ttl=0, path=None)
+
+    def timed(_):
+        t0 = time.perf_counter()
+        try:
+            n = len(search())
+            return time.perf_counter() - t0, n, None
+        except Exception as e:
+            return time.perf_counter() - t0, 0, type(e).__name__
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(timed, range(args.requests)))
+    wall = time.perf_counter() - t0
+
+    lat = sorted(r[0] for r in results)
+    errors = [r[2] for r in results if r[2]]
+    print(f"{args.requests} searches, concurrency {args.concurrency}, {wall:.2f}s -> {args.requests / wall:.1f} req/s")
+    print(f"latency ms: p50 {_pct(lat, 0.5):.1f}  p95 {_pct(lat, 0.95):.1f}  p99 {_pct(lat, 0.99):.1f}  max {lat[-1] * 1000:.1f}")
+    print(f"errors: {len(errors)}  jobs/search: {sum(r[1] for r in results) / len(results):.1f}")
+    for source, status in jobs_api.source_health().items():
+        print(f"  {source:<10} {status}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+Bulk resume ingestion.
+
+    python bulk_ingest.py resumes/ --out resumes.jsonl
+    python bulk_ingest.py cvs.zip --workers 4 --batch-size 32
+
+Walks a directory or a .zip / .tar(.gz) archive of PDF, DOCX and TXT
+resumes, parses them across a process pool, runs spaCy NER over batches
+with nlp.pipe (all other pipeline components disabled) and streams one
+JSONL record per file as it finishes. NER batches are cut at --batch-size
+records or --flush-ms after the oldest waiting record, whichever comes
+first, so a slow tail never holds back finished files (without NER each
+record is written as soon as it is parsed). Only a bounded number of
+files is in flight, so memory stays flat however large the input is.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tarfile
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterator, List, Optional, Tuple
+
+RESUME_EXTENSIONS = (".pdf", ".docx", ".txt")
+NER_CHARS = 5000  # names/orgs live near the top; keeps NER cost per CV bounded
+FLUSH_MS = 250  # longest a parsed record waits for its NER batch to fill
+
+# ---------- input walking ----------
+def iter_inputs(path: str) -> Iterator[Tuple[str, Optional[str], Optional[bytes]]]:
+    """Yield (name, file path, bytes): directories give paths, archives give member bytes."""
+    if os.path.isdir(path):
+        for root, _, files in os.walk(path):
+            for fn in sorted(files):
+                if fn.lower().endswith(RESUME_EXTENSIONS):
+                    full = os.path.join(root, fn)
+                    yield os.path.relpath(full, path), full, None
+    elif zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as zf:
+            for info in zf.infolist():
+                if not info.is_dir() and info.filename.lower().endswith(RESUME_EXTENSIONS):
+                    yield info.filename, None, zf.read(info)
+    elif tarfile.is_tarfile(path):
+        with tarfile.open(path, "r:*") as tf:
+            for member in tf:
+                if member.isfile() and member.name.lower().endswith(RESUME_EXTENSIONS):
+                    f = tf.extractfile(member)
+                    if f is not None:
+                        yield member.name, None, f.read()
+    elif path.lower().endswith(RESUME_EXTENSIONS):
+        yield os.path.basename(path), path, None
+    else:
+        raise ValueError(f"{path} is not a directory, archive or resume file")
+
+# ---------- worker side ----------
+_skills: Optional[List[str]] = None
+
+def _parse_one(name: str, path: Optional[str], data: Optional[bytes]) -> Dict:
+    global _skills
+    import resume_parser
+    from skill_matcher import extract_skills_from_text, load_skills
+
+    record: Dict = {"file": name}
+    t0 = time.perf_counter()
+    try:
+        if data is None:
+            with open(path, "rb") as f:
+                data = f.read()
+        t1 = time.perf_counter()
+        low = name.lower()
+        if low.endswith(".pdf"):
+            text = resume_parser.extract_text_from_pdf(data, parallel=False)
+        elif low.endswith(".docx"):
+            text = resume_parser.extract_text_from_docx(data)
+        else:
+            text = data.decode("utf-8", errors="ignore")
+        t2 = time.perf_counter()
+        if _skills is None:
+            _skills = load_skills() if os.path.exists("skills.json") else []
+        record.update(
+            contacts=resume_parser.extract_contact_info(text),
+            skills=extract_skills_from_text(text, _skills),
+            chars=len(text),
+            text=text,
+        )
+        t3 = time.perf_counter()
+        record["timings_ms"] = {
+            "read": round((t1 - t0) * 1000, 1),
+            "parse": round((t2 - t1) * 1000, 1),
+            "skills": round((t3 - t2) * 1000, 1),
+        }
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+    return record
+
+# ---------- main process ----------
+def _ner_pipe(nlp, records: List[Dict], batch_size: int):
+    """Annotate records in place with PERSON / ORG entities from one nlp.pipe pass."""
+    todo = [r for r in records if r.get("text")]
+    if not todo or nlp is None:
+        return
+    t0 = time.perf_counter()
+    keep = [p for p in ("ner",) if p in nlp.pipe_names]
+    with nlp.select_pipes(enable=keep):
+        docs = nlp.pipe((r["text"][:NER_CHARS] for r in todo), batch_size=batch_size)
+        for r, doc in zip(todo, docs):
+            persons = [e.text.strip() for e in doc.ents if e.label_ == "PERSON"]
+            orgs = [e.text.strip() for e in doc.ents if e.label_ == "ORG"]
+            r["name"] = persons[0] if persons else r["contacts"].get("name_guess", "")
+            r["organizations"] = list(dict.fromkeys(orgs))[:20]
+    per_doc = (time.perf_counter() - t0) * 1000 / len(todo)
+    for r in todo:
+        r["timings_ms"]["ner"] = round(per_doc, 1)
+
+def run(path: str, out, workers: int, batch_size: int, include_text: bool, use_ner: bool,
+        flush_ms: float = FLUSH_MS) -> Dict:
+    nlp = None
+    if use_ner:
+        from resume_parser import get_nlp
+        try:
+            nlp = get_nlp()
+        except Exception as e:
+            print(f"spaCy unavailable, skipping NER: {e}", file=sys.stderr)
+
+    stats = {"files": 0, "errors": 0}
+    batch: List[Dict] = []
+    # Without NER there is nothing to batch: every record goes out on its own
+    limit = batch_size if nlp is not None else 1
+    deadline: Optional[float] = None  # flush time of the oldest waiting record
+
+    def flush():
+        nonlocal deadline
+        _ner_pipe(nlp, batch, batch_size)
+        for r in batch:
+            if not include_text:
+                r.pop("text", None)
+            out.write(json.dumps(r, ensure_ascii=False) + "\n")
+        out.flush()
+        batch.clear()
+        deadline = None
+
+    window = max(2, workers * 2)
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+        pending = set()
+        inputs = iter_inputs(path)
+        exhausted = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) < window:
+                try:
+                    name, fpath, data = next(inputs)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending.add(pool.submit(_parse_one, name, fpath, data))
+            if not pending:
+                break
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for fut in done:
+                record = fut.result()
+                stats["files"] += 1
+                stats["errors"] += "error" in record
+                batch.append(record)
+                if deadline is None:
+                    deadline = time.monotonic() + flush_ms / 1000.0
+                if len(batch) >= limit:
+                    flush()
+            if batch and time.monotonic() >= deadline:
+                flush()
+    if batch:
+        flush()
+    return stats
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("path", help="directory, .zip/.tar(.gz) archive or single resume")
+    ap.add_argument("--out", help="JSONL output file (default: stdout)")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--batch-size", type=int, default=32, help="max records per nlp.pipe batch")
+    ap.add_argument("--flush-ms", type=float, default=FLUSH_MS,
+                    help="max time a parsed record waits for its NER batch to fill")
+    ap.add_argument("--include-text", action="store_true", help="keep extracted text in the records")
+    ap.add_argument("--no-ner", action="store_true", help="skip spaCy entity extraction")
+    args = ap.parse_args()
+
+    out = open(args.out, "w", encoding="utf-8") if args.out else sys.stdout
+    t0 = time.perf_counter()
+    try:
+        stats = run(args.path, out, max(1, args.workers), max(1, args.batch_size), args.include_text, not args.no_ner,
+                    max(0.0, args.flush_ms))
+    finally:
+        if args.out:
+            out.close()
+    elapsed = time.perf_counter() - t0
+    print(f"{stats['files']} files ({stats['errors']} errors) in {elapsed:.1f}s "
+          f"-> {stats['files'] / max(elapsed, 1e-9):.1f} files/s", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,6 @@ from functools import lru_cache
 
 import streamlit as st
 from dotenv import load_dotenv
-from pymongo import MongoClient
 
 load_dotenv()
 
@@ -19,6 +18,9 @@ def _get_secret(key: str, default=None):
 
 @lru_cache(maxsize=1)
 def get_client():
+    # pymongo is imported (and the client created) on first use, not at page import
+    from pymongo import MongoClient
+
     uri = _get_secret("MONGODB_URI")
     if not uri:
         raise RuntimeError("MONGODB_URI not set")
@@ -26,21 +28,24 @@ def get_client():
     return MongoClient(uri, serverSelectionTimeoutMS=3000)
 
 
-_db = get_client()[_get_secret("MONGODB_DB", "aiml_project")]
+@lru_cache(maxsize=1)
+def get_db():
+    return get_client()[_get_secret("MONGODB_DB", "aiml_project")]
 
 
 def get_collection(name: str):
-    return _db[name]
+    return get_db()[name]
 
 
 def get_mongo_collection():
+    db = get_db()
     collection = _get_secret("MONGODB_COLLECTION", "job_matches")
-    return _db, _db[collection]
+    return db, db[collection]
 
 
 class Database:
     def __init__(self):
-        self.users = _db["users"]
+        self.users = get_db()["users"]
 
     def create_user(self, email, password, name=None):
         if self.users.find_one({"email": email}):
@@ -0,0 +1,236 @@
+import hashlib
+import json
+import os
+import pathlib
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from quantize import dequantize, quantize, storage_dtype
+
+DEFAULT_CACHE_DIR = os.getenv("EMBED_CACHE_DIR", ".cache/embeddings")
+# Disk-tier row format (see quantize.STORAGE_MODES); memory tier is always float32
+DEFAULT_STORAGE = os.getenv("EMBED_CACHE_STORAGE", "float32")
+_VECTOR_FILES = {"float32": "vectors.f32", "float16": "vectors.f16", "int8": "vectors.i8"}
+
+def normalize_text(text: str) -> str:
+    # Collapse whitespace so reflowed copies of the same text share a key
+    return " ".join((text or "").split())
+
+def cache_key(model_name: str, text: str) -> str:
+    h = hashlib.sha256()
+    h.update(model_name.encode("utf-8"))
+    h.update(b"\0")
+    h.update(normalize_text(text).encode("utf-8"))
+    return h.hexdigest()
+
+class EmbeddingCache:
+    """
+    Two-tier, content-addressed embedding cache.
+    - memory: OrderedDict LRU of at most `memory_items` vectors
+    - disk:   memmap of `disk_items` rows plus an append-only
+              "key slot" log (compacted when it grows past a few times the
+              capacity); least recently used slot is overwritten when full.
+              storage="float16" / "int8" (per-row scale, in a second
+              memmap) stores rows at 1/2 / ~1/4 of the float32 size and
+              serves them dequantized
+    A put appends one log line per new key and leaves the memmap pages to
+    the OS, so a miss costs microseconds, not a full index rewrite. Safe for
+    threads in one process (Streamlit sessions); not for several processes
+    writing the same directory.
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_CACHE_DIR, memory_items: int = 2048, disk_items: int = 50000,
+                 storage: str = DEFAULT_STORAGE):
+        self.memory_items = memory_items
+        self.disk_items = disk_items
+        self.storage = storage
+        self._dtype = storage_dtype(storage)
+        self._mem: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._dir = pathlib.Path(path) if path else None
+        self._slots: "OrderedDict[str, int]" = OrderedDict()
+        self._vectors: Optional[np.memmap] = None
+        self._scales: Optional[np.memmap] = None
+        self._log = None
+        self._log_lines = 0
+        self._dim: Optional[int] = None
+        if self._dir is not None:
+            self._open_disk()
+
+    # ---------- disk tier ----------
+    @property
+    def _meta_path(self) -> pathlib.Path:
+        return self._dir / "meta.json"
+
+    @property
+    def _log_path(self) -> pathlib.Path:
+        return self._dir / "keys.log"
+
+    @property
+    def _vectors_path(self) -> pathlib.Path:
+        return self._dir / _VECTOR_FILES[self.storage]
+
+    @property
+    def _scales_path(self) -> pathlib.Path:
+        return self._dir / "scales.f32"
+
+    def _map(self, dim: int, mode: str):
+        self._vectors = np.memmap(self._vectors_path, dtype=self._dtype, mode=mode, shape=(self.disk_items, dim))
+        self._scales = None
+        if self.storage == "int8":
+            self._scales = np.memmap(self._scales_path, dtype=np.float32, mode=mode, shape=(self.disk_items,))
+
+    def _open_disk(self):
+        try:
+            meta = json.loads(self._meta_path.read_text(encoding="utf-8"))
+            if (meta.get("capacity") != self.disk_items or meta.get("storage", "float32") != self.storage
+                    or not self._vectors_path.exists()):
+                return
+            self._dim = int(meta["dim"])
+            self._map(self._dim, "r+")
+            self._slots = self._replay_log()
+            self._log = open(self._log_path, "a", encoding="utf-8")
+        except Exception:
+            self._dim, self._vectors, self._scales, self._slots = None, None, None, OrderedDict()
+
+    def _replay_log(self) -> "OrderedDict[str, int]":
+        # Later lines win; a reassigned slot evicts its previous key. Order is
+        # assignment order, which approximates LRU across restarts.
+        slots: "OrderedDict[str, int]" = OrderedDict()
+        owner = {}
+        self._log_lines = 0
+        if not self._log_path.exists():
+            return slots
+        with open(self._log_path, "r", encoding="utf-8") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) != 2 or not parts[1].isdigit():
+                    continue  # torn last line
+                key, slot = parts[0], int(parts[1])
+                if slot >= self.disk_items:
+                    continue
+                old = owner.get(slot)
+                if old is not None and slots.get(old) == slot:
+                    del slots[old]
+                slots.pop(key, None)
+                slots[key] = slot
+                owner[slot] = key
+                self._log_lines += 1
+        return slots
+
+    def _create_disk(self, dim: int):
+        self._dir.mkdir(parents=True, exist_ok=True)
+        if self._log is not None:
+            self._log.close()
+        self._dim = dim
+        self._map(dim, "w+")
+        self._slots = OrderedDict()
+        self._write_meta()
+        self._rewrite_log()
+
+    def _write_meta(self):
+        tmp = self._meta_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"dim": self._dim, "capacity": self.disk_items, "storage": self.storage}), encoding="utf-8")
+        os.replace(tmp, self._meta_path)
+
+    def _rewrite_log(self):
+        # Compaction: one line per live key, in LRU order
+        self._vectors.flush()
+        if self._scales is not None:
+            self._scales.flush()
+        if self._log is not None:
+            self._log.close()
+        tmp = self._log_path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.writelines(f"{k} {v}\n" for k, v in self._slots.items())
+        os.replace(tmp, self._log_path)
+        self._log = open(self._log_path, "a", encoding="utf-8")
+        self._log_lines = len(self._slots)
+
+    def _disk_put(self, key: str, vec: np.ndarray):
+        if key in self._slots:
+            self._slots.move_to_end(key)
+            return
+        if len(self._slots) < self.disk_items:
+            slot = len(self._slots)
+        else:
+            _, slot = self._slots.popitem(last=False)
+        data, scale = quantize(vec[None, :], self.storage)
+        self._vectors[slot] = data[0]
+        if scale is not None:
+            self._scales[slot] = scale[0]
+        self._slots[key] = slot
+        self._log.write(f"{key} {slot}\n")
+        self._log_lines += 1
+
+    # ---------- memory tier ----------
+    def _mem_put(self, key: str, vec: np.ndarray):
+        self._mem[key] = vec
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.memory_items:
+            self._mem.popitem(last=False)
+
+    # ---------- public API ----------
+    def get(self, key: str) -> Optional[np.ndarray]:
+        return self.get_many([key])[0]
+
+    def put(self, key: str, vec: np.ndarray):
+        self.put_many([key], [vec])
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[np.ndarray]]:
+        out: List[Optional[np.ndarray]] = []
+        with self._lock:
+            for key in keys:
+                vec = self._mem.get(key)
+                if vec is not None:
+                    self._mem.move_to_end(key)
+                elif self._vectors is not None and key in self._slots:
+                    self._slots.move_to_end(key)
+                    slot = self._slots[key]
+                    scale = self._scales[slot:slot + 1] if self._scales is not None else None
+                    vec = dequantize(self._vectors[slot:slot + 1], scale)[0]
+                    self._mem_put(key, vec)
+                out.append(vec)
+        return out
+
+    def put_many(self, keys: Sequence[str], vecs: Sequence[np.ndarray]):
+        if not keys:
+            return
+        with self._lock:
+            for key, vec in zip(keys, vecs):
+                vec = np.asarray(vec, dtype=np.float32).reshape(-1)
+                self._mem_put(key, vec)
+                if self._dir is None:
+                    continue
+                if self._vectors is None or self._dim != vec.shape[0]:
+                    self._create_disk(vec.shape[0])
+                self._disk_put(key, vec)
+            if self._log is not None:
+                try:
+                    if self._log_lines > 4 * self.disk_items:
+                        self._rewrite_log()
+                    else:
+                        self._log.flush()
+                except OSError:
+                    pass
+
+    def flush(self):
+        """Write the memmap and compact the key log (done automatically as the log grows)."""
+        with self._lock:
+            if self._vectors is not None:
+                self._rewrite_log()
+
+    def clear(self):
+        with self._lock:
+            self._mem.clear()
+            self._slots.clear()
+            if self._vectors is not None:
+                self._rewrite_log()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(set(self._mem) | set(self._slots))
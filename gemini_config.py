@@ -1,9 +1,8 @@
 # gemini_config.py
 import os
+import threading
 import streamlit as st
-from functools import lru_cache
 from dotenv import load_dotenv
-from google import genai
 
 load_dotenv()
 
@@ -15,9 +14,48 @@ def _get_key():
         return os.getenv("GEMINI_API_KEY")
 
 
-@lru_cache(maxsize=1)
-def get_gemini_client():
+# Only a working client is kept; errors are retried on the next call, so a
+# key added to secrets or an SDK installed later is picked up without a restart.
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_gemini():
+    """
+    (client, new_sdk, error) for the Gemini-backed pages.
+    The SDK is imported on first call: google.genai if available,
+    otherwise the old google.generativeai module.
+    """
+    global _client
+    if _client is not None:
+        return _client
+    with _client_lock:
+        if _client is None:
+            result = _connect()
+            if result[2] is not None:
+                return result
+            _client = result
+    return _client
+
+
+def _connect():
     key = _get_key()
     if not key:
-        raise RuntimeError("GEMINI_API_KEY not set")
-    return genai.Client(api_key=key)
+        return None, False, "GEMINI_API_KEY not set in environment variables."
+
+    try:
+        from google.genai import Client  # new SDK
+    except Exception:
+        Client = None
+
+    try:
+        if Client:
+            return Client(api_key=key), True, None
+        import google.generativeai as genai  # old SDK
+
+        genai.configure(api_key=key)
+        return genai, False, None
+    except ImportError:
+        return None, False, "No Gemini SDK available"
+    except Exception as e:
+        return None, False, str(e)
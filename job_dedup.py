@@ -0,0 +1,96 @@
+import re
+import zlib
+from collections import defaultdict
+from typing import Dict, List, Set, Tuple
+
+import numpy as np
+
+TAG_RE = re.compile(r"<[^>]+>")
+WORD_RE = re.compile(r"[a-z0-9+#]+")
+
+NUM_PERM = 64
+BANDS = 16               # 16 bands x 4 rows: pairs above ~0.5 Jaccard become candidates
+ROWS = NUM_PERM // BANDS
+MIN_JACCARD = 0.7        # estimated shingle Jaccard needed to merge two postings
+MIN_TITLE_JACCARD = 0.5  # and their titles must overlap (same company, different role != dup)
+
+_PRIME = (1 << 31) - 1
+_rng = np.random.default_rng(1234)
+_PERM_A = _rng.integers(1, _PRIME, NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.integers(0, _PRIME, NUM_PERM, dtype=np.uint64)
+
+def _words(text: str) -> List[str]:
+    return WORD_RE.findall(TAG_RE.sub(" ", text or "").lower())
+
+def shingles(job: Dict) -> Set[str]:
+    """Title/company words plus 3-word shingles of the description (HTML stripped)."""
+    title = _words(job.get("title", ""))
+    company = _words((job.get("company") or {}).get("display_name", ""))
+    desc = _words(job.get("description", ""))
+    feats = {f"t:{w}" for w in title} | {f"c:{w}" for w in company}
+    feats |= {"d:" + " ".join(desc[i:i + 3]) for i in range(max(1, len(desc) - 2))} if desc else set()
+    return feats
+
+def minhash(job: Dict) -> np.ndarray:
+    """NUM_PERM-value MinHash signature of shingles(job)."""
+    feats = shingles(job)
+    if not feats:
+        return np.full(NUM_PERM, _PRIME, dtype=np.uint64)
+    x = np.array([zlib.crc32(f.encode("utf-8")) for f in feats], dtype=np.uint64)
+    return ((np.outer(x, _PERM_A) + _PERM_B) % _PRIME).min(axis=0)
+
+def _richness(job: Dict) -> Tuple[int, int]:
+    filled = sum(1 for v in job.values() if v not in (None, "", {}, []))
+    return len(job.get("description", "") or ""), filled
+
+def _title_jaccard(a: Dict, b: Dict) -> float:
+    s1, s2 = set(_words(a.get("title", ""))), set(_words(b.get("title", "")))
+    if not s1 and not s2:
+        return 1.0
+    return len(s1 & s2) / len(s1 | s2)
+
+def dedupe_jobs(jobs: List[Dict]) -> Tuple[List[Dict], int]:
+    """
+    Collapse near-duplicate postings (possibly from different sources).
+    Candidates come from MinHash-LSH band buckets, so the work is roughly
+    linear in len(jobs); a candidate pair is merged when its estimated
+    Jaccard is >= MIN_JACCARD and the titles overlap. The richest record of
+    each cluster is kept, in first-seen order. Returns (jobs, removed).
+    """
+    n = len(jobs)
+    if n < 2:
+        return list(jobs), 0
+    sigs = np.vstack([minhash(j) for j in jobs])
+
+    parent = list(range(n))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    buckets: Dict[Tuple[int, bytes], List[int]] = defaultdict(list)
+    for i in range(n):
+        for b in range(BANDS):
+            buckets[(b, sigs[i, b * ROWS:(b + 1) * ROWS].tobytes())].append(i)
+
+    for members in buckets.values():
+        if len(members) < 2:
+            continue
+        for x, i in enumerate(members):
+            for j in members[x + 1:]:
+                if find(i) == find(j):
+                    continue
+                if (sigs[i] == sigs[j]).mean() >= MIN_JACCARD and _title_jaccard(jobs[i], jobs[j]) >= MIN_TITLE_JACCARD:
+                    parent[find(j)] = find(i)
+
+    best: Dict[int, int] = {}
+    first_seen: Dict[int, int] = {}
+    for i in range(n):
+        root = find(i)
+        first_seen.setdefault(root, i)
+        if root not in best or _richness(jobs[i]) > _richness(jobs[best[root]]):
+            best[root] = i
+    keep = [best[root] for root in sorted(best, key=first_seen.get)]
+    return [jobs[i] for i in keep], n - len(keep)
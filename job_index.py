@@ -0,0 +1,238 @@
+import json
+import pathlib
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+import matcher
+from embedding_cache import cache_key
+from quantize import dequantize, quantize, quantized_dot, storage_dtype
+from resume_doc import ResumeDoc
+from skill_bitsets import annotate_job, get_vocabulary
+
+class JobIndex:
+    """
+    In-process vector index over job postings.
+    Normalized MiniLM embeddings live in one contiguous matrix
+    (row i <-> self.ids[i]); a query is one mat-vec product plus an
+    argpartition for the top-k. After build_ivf() queries only score rows in
+    the n_probe clusters closest to the query.
+    storage="float16" or "int8" (per-row scale) keeps rows quantized and
+    scores them in that form, at 1/2 or ~1/4 of the float32 footprint.
+    """
+
+    def __init__(self, dim: Optional[int] = None, storage: str = "float32"):
+        self.dim = dim
+        self.storage = storage
+        self._dtype = storage_dtype(storage)
+        self.ids: List[str] = []
+        self.jobs: Dict[str, Dict] = {}
+        self._row: Dict[str, int] = {}
+        self._size = 0
+        self._matrix = np.zeros((0, dim or 0), dtype=self._dtype)
+        self._scales = np.ones(0, dtype=np.float32)
+        # IVF state: centroids (n_lists, dim), cluster id per row
+        self.centroids: Optional[np.ndarray] = None
+        self._assign = np.zeros(0, dtype=np.int32)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self._row
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Rows in their stored (possibly quantized) form."""
+        return self._matrix[:self._size]
+
+    @property
+    def nbytes(self) -> int:
+        scales = self._scales[:self._size].nbytes if self.storage == "int8" else 0
+        return self.matrix.nbytes + scales
+
+    def _row_scales(self, rows=None) -> Optional[np.ndarray]:
+        if self.storage != "int8":
+            return None
+        scales = self._scales[:self._size]
+        return scales if rows is None else scales[rows]
+
+    def vectors(self) -> np.ndarray:
+        """Rows decoded to float32."""
+        return dequantize(self.matrix, self._row_scales())
+
+    @staticmethod
+    def job_id(job: Dict) -> str:
+        return job.get("id") or job.get("redirect_url") or cache_key(matcher.MODEL_NAME, matcher._job_text(job))
+
+    # ---------- mutation ----------
+    def _reserve(self, extra: int):
+        need = self._size + extra
+        if need <= self._matrix.shape[0]:
+            return
+        cap = max(need, 2 * self._matrix.shape[0], 64)
+        grown = np.zeros((cap, self.dim), dtype=self._dtype)
+        grown[:self._size] = self._matrix[:self._size]
+        self._matrix = grown
+        scales = np.ones(cap, dtype=np.float32)
+        scales[:self._size] = self._scales[:self._size]
+        self._scales = scales
+        assign = np.zeros(cap, dtype=np.int32)
+        assign[:self._size] = self._assign[:self._size]
+        self._assign = assign
+
+    def add(self, jobs: Sequence[Dict], embeddings: Optional[np.ndarray] = None, ids: Optional[Sequence[str]] = None) -> List[str]:
+        """Add (or replace) jobs; embeddings are computed via matcher.encode_texts when not given."""
+        if not jobs:
+            return []
+        ids = list(ids) if ids is not None else [self.job_id(j) for j in jobs]
+        # Duplicate ids within the batch (job_id falls back to redirect_url): last one wins
+        last = {job_id: pos for pos, job_id in enumerate(ids)}
+        if len(last) < len(ids):
+            keep = sorted(last.values())
+            ids = [ids[p] for p in keep]
+            jobs = [jobs[p] for p in keep]
+            if embeddings is not None:
+                embeddings = np.asarray(embeddings)[keep]
+        vocab = get_vocabulary()
+        if vocab is not None:
+            for job in jobs:
+                annotate_job(job, vocab)
+        if embeddings is None:
+            embeddings = matcher.encode_texts([matcher._job_text(j) for j in jobs])
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        embeddings = embeddings / np.maximum(norms, 1e-12)
+
+        if self.dim is None or self._matrix.shape[1] != embeddings.shape[1]:
+            if self._size:
+                raise ValueError(f"Embedding dim {embeddings.shape[1]} does not match index dim {self.dim}")
+            self.dim = embeddings.shape[1]
+            self._matrix = np.zeros((0, self.dim), dtype=self._dtype)
+
+        self.remove([i for i in ids if i in self._row])
+        self._reserve(len(ids))
+        start = self._size
+        data, scales = quantize(embeddings, self.storage)
+        self._matrix[start:start + len(ids)] = data
+        if scales is not None:
+            self._scales[start:start + len(ids)] = scales
+        if self.centroids is not None:
+            self._assign[start:start + len(ids)] = np.argmax(embeddings @ self.centroids.T, axis=1)
+        for offset, (job_id, job) in enumerate(zip(ids, jobs)):
+            self._row[job_id] = start + offset
+            self.ids.append(job_id)
+            self.jobs[job_id] = job
+        self._size += len(ids)
+        return ids
+
+    def remove(self, ids: Sequence[str]) -> int:
+        """Remove jobs by id; the last row is swapped into each hole to keep the matrix contiguous."""
+        removed = 0
+        for job_id in ids:
+            row = self._row.pop(job_id, None)
+            if row is None:
+                continue
+            last = self._size - 1
+            if row != last:
+                moved = self.ids[last]
+                self._matrix[row] = self._matrix[last]
+                self._scales[row] = self._scales[last]
+                self._assign[row] = self._assign[last]
+                self.ids[row] = moved
+                self._row[moved] = row
+            self.ids.pop()
+            self.jobs.pop(job_id, None)
+            self._size -= 1
+            removed += 1
+        return removed
+
+    # ---------- IVF ----------
+    def build_ivf(self, n_lists: Optional[int] = None, iters: int = 10, seed: int = 0):
+        """Spherical k-means over the rows; n_lists defaults to ~sqrt(N)."""
+        data = self.vectors()
+        if not len(data):
+            self.centroids = None
+            return
+        n_lists = min(n_lists or max(1, int(np.sqrt(len(data)))), len(data))
+        rng = np.random.default_rng(seed)
+        centroids = data[rng.choice(len(data), n_lists, replace=False)].copy()
+        for _ in range(iters):
+            assign = np.argmax(data @ centroids.T, axis=1)
+            for c in range(n_lists):
+                members = data[assign == c]
+                if len(members):
+                    v = members.sum(axis=0)
+                    centroids[c] = v / max(np.linalg.norm(v), 1e-12)
+        self.centroids = centroids
+        self._assign[:self._size] = np.argmax(data @ centroids.T, axis=1)
+
+    # ---------- query ----------
+    def query(self, query_vec: np.ndarray, k: int = 10, n_probe: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Top-k (job_id, cosine) pairs, best first. n_probe > 0 uses the IVF lists if built."""
+        if not self._size or k <= 0:
+            return []
+        q = np.asarray(query_vec, dtype=np.float32).reshape(-1)
+        q = q / max(float(np.linalg.norm(q)), 1e-12)
+
+        if n_probe and self.centroids is not None:
+            probes = np.argsort(-(self.centroids @ q))[:n_probe]
+            rows = np.flatnonzero(np.isin(self._assign[:self._size], probes))
+            scores = quantized_dot(self._matrix[rows], self._row_scales(rows), q)
+        else:
+            rows = None
+            scores = quantized_dot(self.matrix, self._row_scales(), q)
+
+        k = min(k, len(scores))
+        if not k:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        picked = rows[top] if rows is not None else top
+        return [(self.ids[r], float(scores[t])) for r, t in zip(picked, top)]
+
+    def query_text(self, text: str, k: int = 10, n_probe: Optional[int] = None) -> List[Tuple[str, float]]:
+        return self.query(matcher.encode_texts([text or ""])[0], k=k, n_probe=n_probe)
+
+    # ---------- persistence ----------
+    def save(self, path: str):
+        d = pathlib.Path(path)
+        d.mkdir(parents=True, exist_ok=True)
+        np.save(d / "vectors.npy", self.matrix)
+        if self.storage == "int8":
+            np.save(d / "scales.npy", self._row_scales())
+        if self.centroids is not None:
+            np.save(d / "centroids.npy", self.centroids)
+            np.save(d / "assign.npy", self._assign[:self._size])
+        meta = {"dim": self.dim, "storage": self.storage, "ids": self.ids, "jobs": [self.jobs[i] for i in self.ids]}
+        (d / "jobs.json").write_text(json.dumps(meta), encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: str) -> "JobIndex":
+        d = pathlib.Path(path)
+        meta = json.loads((d / "jobs.json").read_text(encoding="utf-8"))
+        index = cls(dim=meta.get("dim"), storage=meta.get("storage", "float32"))
+        index._matrix = np.load(d / "vectors.npy").astype(index._dtype, copy=False)
+        index._size = len(index._matrix)
+        index._scales = np.ones(index._size, dtype=np.float32)
+        if (d / "scales.npy").exists():
+            index._scales = np.load(d / "scales.npy")
+        index._assign = np.zeros(index._size, dtype=np.int32)
+        index.ids = list(meta["ids"])
+        index._row = {job_id: row for row, job_id in enumerate(index.ids)}
+        index.jobs = dict(zip(index.ids, meta["jobs"]))
+        if (d / "centroids.npy").exists():
+            index.centroids = np.load(d / "centroids.npy")
+            index._assign[:index._size] = np.load(d / "assign.npy")
+        return index
+
+def search_jobs(index: JobIndex, resume_text: Union[str, ResumeDoc], resume_skills: Optional[List[str]], top_k: int = 10,
+                candidates: int = 200, n_probe: Optional[int] = None) -> List[Dict]:
+    """
+    Retrieve `candidates` nearest jobs from the index, then run the full
+    compute_scores breakdown (via matcher.rank_jobs, using the jobs' skill
+    bitsets) only on those survivors. A ResumeDoc is embedded once for both.
+    """
+    hits = index.query(matcher.resume_embedding(resume_text), k=candidates, n_probe=n_probe)
+    survivors = [index.jobs[job_id] for job_id, _ in hits]
+    return matcher.rank_jobs(resume_text, resume_skills, survivors, top_k=top_k, vocab=get_vocabulary())
@@ -1,33 +1,102 @@
 import os
-import json
+import time
+import threading
 import requests
-import pathlib
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from concurrent.futures import TimeoutError as FuturesTimeout
+from typing import Callable, Iterator, List, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from job_dedup import dedupe_jobs
+from resilience import get_guard, health
+from response_cache import ResponseCache
+from transport import transport_from_env
 
 # Default country for Adzuna; change if needed via ENV ADZUNA_COUNTRY
 ADZUNA_COUNTRY = os.getenv("ADZUNA_COUNTRY", "in")
+# Extra countries searched by the "All sources" mode, e.g. ADZUNA_COUNTRIES=in,gb,us
+ADZUNA_COUNTRIES = [c.strip() for c in os.getenv("ADZUNA_COUNTRIES", ADZUNA_COUNTRY).split(",") if c.strip()]
+ALL_SOURCES = "All sources"
 
-def _load_local_jobs() -> List[Dict]:
-    p = pathlib.Path("jobs_sample.json")
-    if not p.exists():
-        return []
-    try:
-        return json.loads(p.read_text(encoding="utf-8"))
-    except Exception:
-        return []
+REQUEST_TIMEOUT = 20
+PER_HOST_LIMIT = 4
+
+# ---------- Shared HTTP plumbing ----------
+_transport = None
+_http_lock = threading.Lock()
+_host_slots: Dict[str, threading.BoundedSemaphore] = {}
+
+# Responses keyed on (source, normalized params); TTL / disk tier via JOBS_CACHE_* env
+response_cache = ResponseCache()
+
+# Hedged requests (second attempt after the source's p95 latency) are opt-in
+HEDGE_REQUESTS = os.getenv("JOBS_HEDGE", "0") == "1"
+
+def _guarded(source: str, fetch: Callable[[], List[Dict]]) -> Callable[[], List[Dict]]:
+    """Wrap a fetch with the source's retry budget, circuit breaker and hedging."""
+    guard = get_guard(source, hedge=HEDGE_REQUESTS)
+    return lambda: guard.call(fetch)
+
+def source_health() -> Dict[str, Dict]:
+    """Circuit breaker state and latency percentiles per source."""
+    return health()
+
+def get_transport():
+    """
+    The HTTP transport used by every fetcher: live keep-alive session by
+    default, or record/replay of fixture files (see transport.py,
+    JOBS_TRANSPORT env).
+    """
+    global _transport
+    with _http_lock:
+        if _transport is None:
+            _transport = transport_from_env()
+        return _transport
+
+def set_transport(transport):
+    global _transport
+    with _http_lock:
+        _transport = transport
+
+def _host_slot(url: str) -> threading.BoundedSemaphore:
+    host = urlsplit(url).netloc
+    with _http_lock:
+        if host not in _host_slots:
+            _host_slots[host] = threading.BoundedSemaphore(PER_HOST_LIMIT)
+        return _host_slots[host]
+
+# ---------- Local corpus (SQLite FTS5, no network) ----------
+def get_jobs_local(query: str, location: Optional[str] = None, results_per_page: int = 20, page: int = 1) -> List[Dict]:
+    # Imported here: local_jobs reuses normalize_job from this module
+    from local_jobs import get_local_store
+
+    store = get_local_store()
+    return store.search(query, location, limit=results_per_page, offset=(page - 1) * results_per_page)
+
+def _local_configured() -> bool:
+    # All-sources searches only include Local when a dump or DB is configured
+    from local_jobs import is_configured
+
+    return is_configured()
 
 # ---------- Adzuna ----------
+def _adzuna_credentials() -> Tuple[Optional[str], Optional[str]]:
+    app_id = os.getenv("ADZUNA_APP_ID") or os.getenv("ADZUNAAPPID")
+    app_key = os.getenv("ADZUNA_APP_KEY") or os.getenv("ADZUNAAPPKEY")
+    return app_id, app_key
+
 def get_jobs_adzuna(
     query: str,
     location: str = "India",
     results_per_page: int = 10,
     page: int = 1,
+    country: Optional[str] = None,
 ) -> List[Dict]:
-    app_id = os.getenv("ADZUNA_APP_ID") or os.getenv("ADZUNAAPPID")
-    app_key = os.getenv("ADZUNA_APP_KEY") or os.getenv("ADZUNAAPPKEY")
+    app_id, app_key = _adzuna_credentials()
     if not app_id or not app_key:
         raise RuntimeError("Adzuna credentials missing. Set ADZUNA_APP_ID and ADZUNA_APP_KEY in .env/Secrets.")
-    url = f"https://api.adzuna.com/v1/api/jobs/{ADZUNA_COUNTRY}/search/{page}"
+    country = country or ADZUNA_COUNTRY
+    url = f"https://api.adzuna.com/v1/api/jobs/{country}/search/{page}"
     params = {
         "app_id": app_id,
         "app_key": app_key,
@@ -36,29 +105,93 @@ def get_jobs_adzuna(
         "results_per_page": results_per_page,
         "content-type": "application/json",
     }
-    r = requests.get(url, params=params, timeout=20)
-    r.raise_for_status()
-    data = r.json()
-    return data.get("results", [])
+
+    def fetch() -> List[Dict]:
+        r = get_transport().get(url, params=params, timeout=REQUEST_TIMEOUT)
+        r.raise_for_status()
+        data = r.json()
+        return data.get("results", [])
+
+    cache_params = {"country": country, "what": query, "where": location,
+                    "results_per_page": results_per_page, "page": page}
+    return response_cache.get_or_fetch("adzuna", cache_params, _guarded("adzuna", fetch))
 
 # ---------- Workable (per-company public widget) ----------
-def get_workable_company_jobs(company_slug: str) -> List[Dict]:
+def get_workable_company_jobs(company_slug: str, timeout: float = REQUEST_TIMEOUT) -> List[Dict]:
     url = f"https://apply.workable.com/api/v1/widget/accounts/{company_slug}"
-    r = requests.get(url, timeout=20)
-    r.raise_for_status()
-    data = r.json()
-    jobs: List[Dict] = []
-    for j in data.get("jobs", []):
-        jobs.append({
-            "title": j.get("title", ""),
-            "company": {"display_name": company_slug},
-            "location": {"display_name": j.get("location", "")},
-            "description": (j.get("description", "") or j.get("requirements", "") or ""),
-            "redirect_url": j.get("url", ""),
-        })
-    return jobs
-
-def get_jobs_workable(company_slugs: List[str], limit_per_company: int = 10) -> List[Dict]:
+
+    def fetch() -> List[Dict]:
+        r = get_transport().get(url, timeout=timeout)
+        r.raise_for_status()
+        data = r.json()
+        jobs: List[Dict] = []
+        for j in data.get("jobs", []):
+            jobs.append({
+                "title": j.get("title", ""),
+                "company": {"display_name": company_slug},
+                "location": {"display_name": j.get("location", "")},
+                "description": (j.get("description", "") or j.get("requirements", "") or ""),
+                "redirect_url": j.get("url", ""),
+            })
+        return jobs
+
+    return response_cache.get_or_fetch("workable", {"slug": company_slug}, _guarded("workable", fetch))
+
+def fetch_workable_jobs(
+    company_slugs: List[str],
+    limit_per_company: int = 10,
+    max_workers: int = 8,
+    deadline: float = 30.0,
+) -> Tuple[List[Dict], Dict[str, str]]:
+    """
+    Fetch several Workable companies concurrently over the shared transport.
+    At most PER_HOST_LIMIT requests hit apply.workable.com at once, and the
+    whole call returns after `deadline` seconds with whatever finished.
+    Returns (jobs in slug order, {slug: "timeout" | error message}).
+    """
+    if not company_slugs:
+        return [], {}
+    stop_at = time.monotonic() + deadline
+    slot = _host_slot("https://apply.workable.com/")
+
+    def fetch(slug: str) -> List[Dict]:
+        remaining = stop_at - time.monotonic()
+        if remaining <= 0 or not slot.acquire(timeout=remaining):
+            raise TimeoutError("timeout")
+        try:
+            remaining = stop_at - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError("timeout")
+            return get_workable_company_jobs(slug, timeout=min(REQUEST_TIMEOUT, remaining))
+        finally:
+            slot.release()
+
+    pool = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(company_slugs))), thread_name_prefix="workable")
+    futures = {slug: pool.submit(fetch, slug) for slug in dict.fromkeys(company_slugs)}
+    wait(futures.values(), timeout=max(0.0, stop_at - time.monotonic()))
+    pool.shutdown(wait=False, cancel_futures=True)
+
+    all_jobs: List[Dict] = []
+    failures: Dict[str, str] = {}
+    for slug, fut in futures.items():
+        if not fut.done() or fut.cancelled():
+            failures[slug] = "timeout"
+            continue
+        err = fut.exception()
+        if err is not None:
+            failures[slug] = "timeout" if isinstance(err, (TimeoutError, requests.Timeout)) else str(err)
+            continue
+        all_jobs.extend(fut.result()[:limit_per_company])
+    return all_jobs, failures
+
+def get_jobs_workable(
+    company_slugs: List[str],
+    limit_per_company: int = 10,
+    concurrent: bool = True,
+    deadline: float = 30.0,
+) -> List[Dict]:
+    if concurrent:
+        return fetch_workable_jobs(company_slugs, limit_per_company, deadline=deadline)[0]
     all_jobs: List[Dict] = []
     for slug in company_slugs:
         try:
@@ -77,20 +210,183 @@ def get_jobs_arbeitnow(
 ) -> List[Dict]:
     url = "https://www.arbeitnow.com/api/job-board-api"
     params = {"query": query, "page": page}
-    r = requests.get(url, params=params, timeout=20)
-    r.raise_for_status()
-    data = r.json().get("data", [])
+
+    # Cache the whole page so different results_per_page values share it
+    def fetch() -> List[Dict]:
+        r = get_transport().get(url, params=params, timeout=REQUEST_TIMEOUT)
+        r.raise_for_status()
+        data = r.json().get("data", [])
+        jobs: List[Dict] = []
+        for j in data:
+            loc = ", ".join(filter(None, [j.get("location"), "Remote" if j.get("remote") else None]))
+            jobs.append({
+                "title": j.get("title", ""),
+                "company": {"display_name": j.get("company", "")},
+                "location": {"display_name": loc},
+                "description": j.get("description", "") or "",
+                "redirect_url": j.get("url", ""),
+            })
+        return jobs
+
+    return response_cache.get_or_fetch("arbeitnow", params, _guarded("arbeitnow", fetch))[:results_per_page]
+
+# ---------- Multi-source fan-out ----------
+def normalize_job(job: Dict, source: str) -> Dict:
+    """Common job dict shape used by every fetcher, tagged with its source."""
+    company = job.get("company") or {}
+    location = job.get("location") or {}
+    out = {
+        "title": job.get("title", "") or "",
+        "company": {"display_name": company.get("display_name", "") if isinstance(company, dict) else str(company)},
+        "location": {"display_name": location.get("display_name", "") if isinstance(location, dict) else str(location)},
+        "description": job.get("description", "") or "",
+        "redirect_url": job.get("redirect_url", "") or job.get("url", "") or "",
+        "source": source,
+    }
+    # Optional Adzuna extras and precomputed skill bitsets are kept when present
+    for key in ("id", "created", "salary_min", "salary_max", "contract_type", "skill_bits"):
+        if job.get(key) is not None:
+            out[key] = job[key]
+    return out
+
+def _source_tasks(
+    query: str,
+    location: str,
+    results_per_page: int,
+    workable_companies: List[str],
+    page: int,
+    countries: Optional[List[str]],
+    deadline: float,
+) -> Dict[str, Callable[[], List[Dict]]]:
+    tasks: Dict[str, Callable[[], List[Dict]]] = {}
+    if all(_adzuna_credentials()):
+        for country in countries or ADZUNA_COUNTRIES:
+            tasks[f"Adzuna:{country}"] = (
+                lambda c=country: get_jobs_adzuna(query, location, results_per_page, page, country=c)
+            )
+    tasks["Arbeitnow"] = lambda: get_jobs_arbeitnow(query, location, results_per_page, page)
+    if _local_configured():
+        tasks["Local"] = lambda: get_jobs_local(query, location, results_per_page, page)
+    if workable_companies:
+        per = max(1, results_per_page // max(1, len(workable_companies)))
+        tasks["Workable"] = lambda: fetch_workable_jobs(workable_companies, per, deadline=deadline)[0]
+    return tasks
+
+def iter_jobs_all_sources(
+    query: str,
+    location: str,
+    results_per_page: int,
+    workable_companies: List[str],
+    page: int = 1,
+    countries: Optional[List[str]] = None,
+    deadline: float = 15.0,
+) -> Iterator[Tuple[str, List[Dict], Optional[str]]]:
+    """
+    Query every configured source in parallel and yield
+    (source, normalized jobs, error) as each one completes. Sources still
+    running when `deadline` seconds have passed are yielded as "timeout".
+    """
+    tasks = _source_tasks(query, location, results_per_page, workable_companies, page, countries, deadline)
+    pool = ThreadPoolExecutor(max_workers=len(tasks), thread_name_prefix="jobs-fanout")
+    futures = {pool.submit(fn): name for name, fn in tasks.items()}
+    pending = set(futures)
+    try:
+        for fut in as_completed(futures, timeout=deadline):
+            pending.discard(fut)
+            name = futures[fut]
+            err = fut.exception()
+            if err is not None:
+                yield name, [], str(err)
+            else:
+                yield name, [normalize_job(j, name.split(":")[0]) for j in fut.result()], None
+    except FuturesTimeout:
+        for fut in pending:
+            yield futures[fut], [], "timeout"
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+def get_jobs_all_sources(
+    query: str,
+    location: str,
+    results_per_page: int,
+    workable_companies: List[str],
+    page: int = 1,
+    countries: Optional[List[str]] = None,
+    deadline: float = 15.0,
+    dedupe: bool = True,
+) -> Tuple[List[Dict], Dict]:
+    """
+    Merged jobs from all sources within the latency budget, with
+    cross-source near-duplicates collapsed. The report holds
+    {"failures": {source: error}, "duplicates_removed": int}.
+    """
     jobs: List[Dict] = []
-    for j in data[:results_per_page]:
-        loc = ", ".join(filter(None, [j.get("location"), "Remote" if j.get("remote") else None]))
-        jobs.append({
-            "title": j.get("title", ""),
-            "company": {"display_name": j.get("company", "")},
-            "location": {"display_name": loc},
-            "description": j.get("description", "") or "",
-            "redirect_url": j.get("url", ""),
-        })
-    return jobs
+    failures: Dict[str, str] = {}
+    for name, items, err in iter_jobs_all_sources(
+        query, location, results_per_page, workable_companies, page, countries, deadline
+    ):
+        if err:
+            failures[name] = err
+        jobs.extend(items)
+    removed = 0
+    if dedupe:
+        jobs, removed = dedupe_jobs(jobs)
+    return jobs, {"failures": failures, "duplicates_removed": removed}
+
+# ---------- Streaming pagination ----------
+ARBEITNOW_PAGE_SIZE = 100  # the board API serves fixed 100-job pages
+
+def _page_fetcher(source: str, query: str, location: str, results_per_page: int,
+                  country: Optional[str]) -> Tuple[Callable[[int], List[Dict]], int]:
+    if source == "Adzuna":
+        return (lambda p: get_jobs_adzuna(query, location, results_per_page, p, country=country)), results_per_page
+    if source == "Arbeitnow":
+        return (lambda p: get_jobs_arbeitnow(query, location, ARBEITNOW_PAGE_SIZE, p)), ARBEITNOW_PAGE_SIZE
+    if source == "Local":
+        return (lambda p: get_jobs_local(query, location, results_per_page, p)), results_per_page
+    raise ValueError(f"Source {source!r} does not support pagination")
+
+def iter_jobs(
+    source: str,
+    query: str,
+    location: str = "",
+    results_per_page: int = 20,
+    max_results: int = 100,
+    deadline: Optional[float] = None,
+    start_page: int = 1,
+    country: Optional[str] = None,
+) -> Iterator[Dict]:
+    """
+    Yield normalized jobs page by page from Adzuna, Arbeitnow or Local. The next
+    page is requested in the background as soon as the current one arrives,
+    so callers can score page N while page N+1 is in flight. Stops after
+    `max_results` jobs, on a short/empty page, or once `deadline` seconds
+    have passed (a page still in flight at that point is dropped).
+    """
+    fetch_page, page_size = _page_fetcher(source, query, location, results_per_page, country)
+    stop_at = time.monotonic() + deadline if deadline is not None else None
+    pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"{source.lower()}-pages")
+    page = start_page
+    pending = pool.submit(fetch_page, page)
+    yielded = 0
+    try:
+        while pending is not None and yielded < max_results:
+            timeout = None if stop_at is None else max(0.0, stop_at - time.monotonic())
+            try:
+                jobs = pending.result(timeout=timeout)
+            except FuturesTimeout:
+                return
+            pending = None
+            if len(jobs) >= page_size and yielded + len(jobs) < max_results:
+                page += 1
+                pending = pool.submit(fetch_page, page)
+            for job in jobs:
+                yield normalize_job(job, source)
+                yielded += 1
+                if yielded >= max_results:
+                    return
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
 
 # ---------- Unified router ----------
 def get_jobs(
@@ -108,4 +404,8 @@ def get_jobs(
         return get_jobs_adzuna(query=query, location=location, results_per_page=results_per_page, page=page)
     if source == "Arbeitnow":
         return get_jobs_arbeitnow(query=query, location=location, results_per_page=results_per_page, page=page)
+    if source == "Local":
+        return get_jobs_local(query=query, location=location, results_per_page=results_per_page, page=page)
+    if source == ALL_SOURCES:
+        return get_jobs_all_sources(query, location, results_per_page, workable_companies, page=page)[0]
     return []
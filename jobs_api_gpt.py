@@ -1,114 +1,74 @@
 from __future__ import annotations
+import os
 from urllib.parse import quote_plus
 
+from resume_doc import ResumeDoc, as_resume_doc
+from role_catalog import get_role_catalog
+from skill_taxonomy import get_taxonomy
 
-# ================= SKILL EXTRACTION =================
-def extract_resume_skills(resume_text: str) -> set[str]:
-    text = resume_text.lower()
-
-    skill_map = {
-        # Programming
-        "python": "Python",
-        "java": "Java",
-        "c++": "C++",
-
-        # Web
-        "html": "HTML",
-        "css": "CSS",
-        "javascript": "JavaScript",
-        "react": "React",
-        "node": "Node.js",
-        "flask": "Flask",
-        "django": "Django",
-
-        # Data / ML
-        "machine learning": "Machine Learning",
-        "deep learning": "Deep Learning",
-        "data analysis": "Data Analysis",
-        "pandas": "Pandas",
-        "numpy": "NumPy",
-        "sql": "SQL",
-
-        # DevOps / Cloud
-        "docker": "Docker",
-        "kubernetes": "Kubernetes",
-        "linux": "Linux",
-        "aws": "AWS",
-        "git": "Git",
-    }
-
-    skills = set()
-    for key, value in skill_map.items():
-        if key in text:
-            skills.add(value)
-
-    return skills
-
-
-# ================= JOB ROLE → REQUIRED SKILLS =================
-ROLE_SKILLS = {
-    "Machine Learning Engineer": {
-        "Python", "Machine Learning", "NumPy", "Pandas", "Model Deployment", "MLOps"
-    },
-    "Data Scientist": {
-        "Python", "Statistics", "Machine Learning", "SQL", "Data Visualization"
-    },
-    "Data Analyst": {
-        "SQL", "Excel", "Power BI", "Data Analysis", "Statistics"
-    },
-    "Backend Developer": {
-        "Python", "Django", "Flask", "REST APIs", "Databases"
-    },
-    "Frontend Developer": {
-        "HTML", "CSS", "JavaScript", "React", "UI/UX"
-    },
-    "Full Stack Developer": {
-        "JavaScript", "React", "Node.js", "Databases", "REST APIs"
-    },
-    "DevOps Engineer": {
-        "Docker", "Kubernetes", "CI/CD", "Linux", "AWS"
-    },
-    "Software Engineer": {
-        "Data Structures", "Algorithms", "OOP", "Git", "Problem Solving"
-    },
-}
-
-
-# ================= ROLE INFERENCE =================
-def infer_job_roles(skills: set[str]) -> list[str]:
-    roles = []
-
-    if {"Machine Learning", "Deep Learning"} & skills:
-        roles += ["Machine Learning Engineer", "Data Scientist"]
-
-    if {"Data Analysis", "SQL"} & skills:
-        roles += ["Data Analyst"]
-
-    if {"React", "JavaScript"} & skills:
-        roles += ["Frontend Developer", "Full Stack Developer"]
 
-    if {"Flask", "Django"} & skills:
-        roles += ["Backend Developer"]
-
-    if {"Docker", "AWS"} & skills:
-        roles += ["DevOps Engineer"]
+# ================= SKILL EXTRACTION =================
+def extract_resume_skills(resume_text: str | ResumeDoc) -> set[str]:
+    if isinstance(resume_text, ResumeDoc):
+        return set(resume_text.skills)
+    return skills_in_text(resume_text.lower())
 
-    if {"Java", "C++"} & skills:
-        roles += ["Software Engineer"]
 
-    # Fallback
-    if not roles:
-        roles = ["Software Engineer", "Backend Developer", "Data Analyst"]
+def skills_in_text(text: str) -> set[str]:
+    """
+    Canonical skill names found in text (ResumeDoc.skills calls this once per
+    resume). Names and aliases come from skill_taxonomy.json and are matched
+    on whole tokens, so "java" does not fire on "javascript".
+    """
+    return get_taxonomy().find(text)
 
-    # Deduplicate and limit to 5
-    final = []
-    for r in roles:
-        if r not in final:
-            final.append(r)
-        if len(final) == 5:
-            break
 
-    return final
+# ================= ROLE INFERENCE =================
+# Roles and their required / optional skills live in roles.json (see role_catalog)
+TOP_ROLES = 5
+FALLBACK_ROLES = ["Software Engineer", "Backend Developer", "Data Analyst"]
+# "skills": keyword skill points only; "semantic": resume/role embedding similarity blended with skill overlap
+ROLE_INFERENCE = os.getenv("ROLE_INFERENCE", "skills")
+
+
+def _clamp_score(score: float) -> int:
+    return int(max(min(score, 95), 45))
+
+
+def _ranked_roles(
+    skills: set[str], limit: int, resume: ResumeDoc | None = None, mode: str | None = None
+) -> list[tuple[int, int]]:
+    """(catalog row, match score 45..95) of the best roles, best first."""
+    catalog = get_role_catalog()
+    vec = catalog.skill_vector(skills)
+
+    if (mode or ROLE_INFERENCE) == "semantic" and resume is not None and len(catalog):
+        try:
+            ranked = catalog.semantic_roles(resume.embedding, vec, k=limit)
+            # Blended 0..100 spread over the same 45..95 band as keyword scores
+            return [(row, _clamp_score(45 + 0.5 * score)) for row, score in ranked]
+        except Exception:
+            # sentence-transformers missing, model download / load or encode
+            # failed: the search still answers, with keyword scoring below
+            pass
+
+    if vec.any():
+        ranked = catalog.top_roles(vec, k=limit)
+    else:
+        # Nothing on the resume maps to a catalog skill: fixed fallback roles
+        scores = catalog.score(vec)
+        rows = [catalog.titles.index(t) for t in FALLBACK_ROLES if t in catalog.titles]
+        ranked = [(i, float(scores[i])) for i in rows[:limit]]
+    return [(row, _clamp_score(60 + points)) for row, points in ranked]
+
+
+def infer_job_roles(
+    skills: set[str], limit: int = TOP_ROLES, resume: str | ResumeDoc | None = None, mode: str | None = None
+) -> list[str]:
+    """Best roles for a skill set; pass the resume (and mode="semantic") to rank by meaning too."""
+    catalog = get_role_catalog()
+    ranked = _ranked_roles(skills, limit, as_resume_doc(resume), mode)
+    return [catalog.titles[i] for i, _ in ranked]
 
 
 # ================= LIVE JOB LINKS =================
@@ -124,36 +84,32 @@ def job_links(role: str, city: str) -> dict:
 
 
 # ================= MAIN MATCH FUNCTION =================
-def match_jobs_with_gpt(resume_text, city, experience, domain):
+def match_jobs_with_gpt(resume_text, city, experience, domain, mode=None):
     """
     FINAL STABLE JOB MATCHER
     ✅ 5 jobs always
     ✅ Jobs differ by resume
     ✅ Missing skills are JOB-SPECIFIC
     ✅ Real job search links
+    resume_text may be a ResumeDoc; plain text is wrapped in the shared one.
+    mode overrides ROLE_INFERENCE ("skills" or "semantic").
     """
 
-    resume_skills = extract_resume_skills(resume_text)
-    roles = infer_job_roles(resume_skills)
+    resume = as_resume_doc(resume_text)
+    resume_skills = resume.skills
+    catalog = get_role_catalog()
 
     matches = []
 
-    for idx, role in enumerate(roles):
-        required = ROLE_SKILLS.get(role, set())
-
-        matched_skills = sorted(required & resume_skills)
-        missing_skills = sorted(required - resume_skills)
-
-        # Score logic
-        score = min(
-            60 + len(matched_skills) * 7 - len(missing_skills) * 2 + idx * 3,
-            95,
-        )
+    # Every catalog role is scored in one mat-vec product; only the top ones are decoded
+    for row, score in _ranked_roles(resume_skills, TOP_ROLES, resume, mode):
+        role = catalog.titles[row]
+        matched_skills, missing_skills = catalog.breakdown(row, resume_skills)
 
         matches.append(
             {
                 "job_title": role,
-                "match_score": max(score, 45),
+                "match_score": score,
                 "matched_skills": matched_skills,
                 "missing_skills": missing_skills,
                 "job_links": job_links(role, city),
@@ -0,0 +1,262 @@
+"""
+Local job corpus: streaming ingest of JSON / JSONL job dumps into SQLite
+with an FTS5 index over title, description and location.
+
+    python local_jobs.py ingest dump.jsonl [more.json ...]
+    python local_jobs.py search "python developer" --location bangalore
+"""
+import argparse
+import hashlib
+import json
+import os
+import pathlib
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+
+from jobs_api import normalize_job
+from skill_bitsets import annotate_job, get_vocabulary
+
+# The store lives in the app's cache directory (next to .cache/embeddings), not the working directory
+DEFAULT_DB = os.getenv("LOCAL_JOBS_DB") or os.path.join(".cache", "jobs_local.db")
+DEFAULT_DUMP = os.getenv("LOCAL_JOBS_FILE", "")
+DUMP_RECHECK_SECONDS = 30.0  # how often searches stat the dump for changes
+INSERT_BATCH = 1000
+READ_CHUNK = 1 << 20
+FTS_TOKEN_RE = re.compile(r"\w+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    uid TEXT UNIQUE NOT NULL,
+    title TEXT, company TEXT, location TEXT, description TEXT,
+    raw TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+    title, description, location, content='jobs', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS jobs_ai AFTER INSERT ON jobs BEGIN
+    INSERT INTO jobs_fts(rowid, title, description, location) VALUES (new.id, new.title, new.description, new.location);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_ad AFTER DELETE ON jobs BEGIN
+    INSERT INTO jobs_fts(jobs_fts, rowid, title, description, location) VALUES ('delete', old.id, old.title, old.description, old.location);
+END;
+CREATE TABLE IF NOT EXISTS ingested_files (
+    path TEXT PRIMARY KEY, size INTEGER, mtime REAL, rows INTEGER
+);
+"""
+
+def iter_job_records(path: str) -> Iterator[Dict]:
+    """
+    Stream job dicts from a JSONL file or a top-level JSON array without
+    loading the whole file. Objects like {"results": [...]} (API dumps) fall
+    back to a single json.load.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        head = f.read(1)
+        while head and head.isspace():
+            head = f.read(1)
+        if head == "[":
+            yield from _iter_json_array(f)
+            return
+        f.seek(0)
+        first = f.readline()
+        try:
+            obj = json.loads(first)
+        except ValueError:
+            obj = None
+        if isinstance(obj, dict) and not (set(obj) & {"results", "jobs", "data"}):
+            yield obj
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+            return
+        f.seek(0)
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get("results") or data.get("jobs") or data.get("data") or []
+    yield from (j for j in data if isinstance(j, dict))
+
+def _iter_json_array(f) -> Iterator[Dict]:
+    # Decode in place at an integer offset; the buffer is only compacted
+    # (consumed prefix dropped) when more input has to be read.
+    decoder = json.JSONDecoder()
+    buf = ""
+    idx = 0
+    eof = False
+    while True:
+        n = len(buf)
+        while idx < n and buf[idx] in " \t\r\n,":
+            idx += 1
+        if idx < n and buf[idx] == "]":
+            return
+        try:
+            if idx >= n:
+                raise ValueError("need more input")
+            obj, idx = decoder.raw_decode(buf, idx)
+        except ValueError:
+            if eof:
+                if buf[idx:].strip():
+                    raise ValueError("Truncated JSON array")
+                return
+            chunk = f.read(READ_CHUNK)
+            eof = not chunk
+            buf = buf[idx:] + chunk
+            idx = 0
+            continue
+        if isinstance(obj, dict):
+            yield obj
+
+def _uid(job: Dict) -> str:
+    if job.get("id"):
+        return f"id:{job['id']}"
+    if job.get("redirect_url"):
+        return f"url:{job['redirect_url']}"
+    blob = "\0".join([job["title"], job["company"]["display_name"], job["description"]])
+    return "sha:" + hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+def _fts_phrase(text: str) -> str:
+    # Quote every token so user input can never be parsed as FTS5 syntax
+    return " ".join(f'"{t}"' for t in FTS_TOKEN_RE.findall(text or ""))
+
+class LocalJobStore:
+    def __init__(self, path: str = DEFAULT_DB):
+        self.path = path
+        self._local = threading.local()
+        parent = os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        with self._conn() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite connections are per-thread; Streamlit sessions run on many threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def __len__(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def ingest(self, path: str, source: str = "Local") -> int:
+        """Stream a dump into the store in batches; re-ingesting a job replaces it."""
+        conn = self._conn()
+        vocab = get_vocabulary()
+        rows = 0
+        batch: List[tuple] = []
+
+        def flush():
+            conn.executemany("DELETE FROM jobs WHERE uid = ?", [(b[0],) for b in batch])
+            conn.executemany(
+                "INSERT INTO jobs (uid, title, company, location, description, raw) VALUES (?, ?, ?, ?, ?, ?)", batch
+            )
+            batch.clear()
+
+        with conn:
+            for record in iter_job_records(path):
+                job = normalize_job(record, record.get("source") or source)
+                if vocab is not None:
+                    annotate_job(job, vocab)  # skill bitset stored with the job
+                batch.append((
+                    _uid(job), job["title"], job["company"]["display_name"],
+                    job["location"]["display_name"], job["description"], json.dumps(job),
+                ))
+                rows += 1
+                if len(batch) >= INSERT_BATCH:
+                    flush()
+            if batch:
+                flush()
+            st = os.stat(path)
+            conn.execute(
+                "INSERT OR REPLACE INTO ingested_files (path, size, mtime, rows) VALUES (?, ?, ?, ?)",
+                (str(pathlib.Path(path).resolve()), st.st_size, st.st_mtime, rows),
+            )
+        return rows
+
+    def ingest_if_changed(self, path: str) -> int:
+        p = pathlib.Path(path)
+        if not p.exists():
+            return 0
+        st = p.stat()
+        row = self._conn().execute(
+            "SELECT size, mtime FROM ingested_files WHERE path = ?", (str(p.resolve()),)
+        ).fetchone()
+        if row and row[0] == st.st_size and row[1] == st.st_mtime:
+            return 0
+        return self.ingest(str(p))
+
+    def search(self, query: str = "", location: Optional[str] = None, limit: int = 20, offset: int = 0) -> List[Dict]:
+        """Keyword (title/description) plus location search, best BM25 match first."""
+        terms = []
+        if _fts_phrase(query):
+            terms.append("{title description}: (" + " OR ".join(f'"{t}"' for t in FTS_TOKEN_RE.findall(query)) + ")")
+        if location and _fts_phrase(location):
+            terms.append("location: (" + _fts_phrase(location) + ")")
+        conn = self._conn()
+        if not terms:
+            rows = conn.execute("SELECT raw FROM jobs ORDER BY id DESC LIMIT ? OFFSET ?", (limit, offset))
+        else:
+            rows = conn.execute(
+                "SELECT jobs.raw FROM jobs_fts JOIN jobs ON jobs.id = jobs_fts.rowid "
+                "WHERE jobs_fts MATCH ? ORDER BY bm25(jobs_fts, 10.0, 1.0, 1.0) LIMIT ? OFFSET ?",
+                (" AND ".join(terms), limit, offset),
+            )
+        return [json.loads(r[0]) for r in rows]
+
+_store: Optional[LocalJobStore] = None
+_store_lock = threading.Lock()
+_dump_checked: Optional[float] = None
+
+def is_configured() -> bool:
+    """True when LOCAL_JOBS_FILE or LOCAL_JOBS_DB is set, i.e. there is a local corpus to search."""
+    return bool(os.getenv("LOCAL_JOBS_FILE") or os.getenv("LOCAL_JOBS_DB"))
+
+def get_local_store() -> LocalJobStore:
+    """
+    Process-wide store; picks up changes to LOCAL_JOBS_FILE, checked at most
+    every DUMP_RECHECK_SECONDS rather than on every search.
+    """
+    global _store, _dump_checked
+    with _store_lock:
+        if _store is None:
+            _store = LocalJobStore()
+        now = time.monotonic()
+        if DEFAULT_DUMP and (_dump_checked is None or now - _dump_checked >= DUMP_RECHECK_SECONDS):
+            _dump_checked = now
+            _store.ingest_if_changed(DEFAULT_DUMP)
+        return _store
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--db", default=DEFAULT_DB)
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    ing = sub.add_parser("ingest")
+    ing.add_argument("files", nargs="+")
+    srch = sub.add_parser("search")
+    srch.add_argument("query")
+    srch.add_argument("--location")
+    srch.add_argument("--limit", type=int, default=10)
+    args = ap.parse_args()
+
+    store = LocalJobStore(args.db)
+    if args.cmd == "ingest":
+        for path in args.files:
+            t0 = time.perf_counter()
+            rows = store.ingest(path)
+            print(f"{path}: {rows} jobs in {time.perf_counter() - t0:.1f}s")
+        print(f"store now holds {len(store)} jobs")
+    else:
+        t0 = time.perf_counter()
+        jobs = store.search(args.query, args.location, limit=args.limit)
+        print(f"{len(jobs)} results in {(time.perf_counter() - t0) * 1000:.1f} ms")
+        for j in jobs:
+            print(f"- {j['title']} @ {j['company']['display_name']} ({j['location']['display_name']})")
+
+if __name__ == "__main__":
+    main()
@@ -1,59 +1,152 @@
-from typing import Dict, List, Tuple
-from sentence_transformers import SentenceTransformer, util 
+import threading
+from typing import Dict, List, Optional, Union
 import numpy as np
 
+from embedding_cache import EmbeddingCache, cache_key
+from model_registry import registry
+from resume_doc import ResumeDoc
+from skill_bitsets import SkillVocabulary, get_vocabulary, jaccard_pct, job_bit_matrix
+from skill_taxonomy import get_taxonomy
+
 MODEL_NAME = "all-MiniLM-L6-v2"
-_model = None
+ENCODE_BATCH_SIZE = 64
+W_SKILL = 0.6
+W_SEM = 0.4
+_cache = None
+_cache_lock = threading.Lock()
 
 def _load_model():
-    global _model
-    if _model is None:
-        _model = SentenceTransformer(MODEL_NAME)
-    return _model
+    return registry.get("sentence")
 
-def semantic_similarity_pct(text1: str, text2: str) -> float:
-    model = _load_model()
-    emb1 = model.encode(text1 or "", convert_to_tensor=True)
-    emb2 = model.encode(text2 or "", convert_to_tensor=True)
-    score = float(util.cos_sim(emb1, emb2).item())  # -1..1
-    pct = (score + 1) * 50.0  # map to 0..100
+def _get_cache() -> EmbeddingCache:
+    # One instance per process: two would append to the same keys.log / memmap
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = EmbeddingCache()
+    return _cache
+
+def encode_texts(texts: List[str], batch_size: int = ENCODE_BATCH_SIZE) -> np.ndarray:
+    """
+    L2-normalized float32 embeddings for texts, shape (len(texts), dim).
+    Cached vectors are served without touching the model; only misses are
+    encoded, in batches.
+    """
+    cache = _get_cache()
+    keys = [cache_key(MODEL_NAME, t) for t in texts]
+    vecs = cache.get_many(keys)
+
+    missing: Dict[str, str] = {}
+    for key, text, vec in zip(keys, texts, vecs):
+        if vec is None:
+            missing.setdefault(key, text or "")
+    if missing:
+        model = _load_model()
+        encoded = model.encode(
+            list(missing.values()),
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+        )
+        cache.put_many(list(missing), list(encoded))
+        fresh = dict(zip(missing, encoded))
+        vecs = [v if v is not None else fresh[k] for k, v in zip(keys, vecs)]
+
+    return np.vstack(vecs).astype(np.float32, copy=False)
+
+def resume_embedding(resume: Union[str, ResumeDoc]) -> np.ndarray:
+    """A ResumeDoc's memoized embedding, or a (cached) encode of plain text."""
+    if isinstance(resume, ResumeDoc):
+        return resume.embedding
+    return encode_texts([resume or ""])[0]
+
+def _resume_skills(resume, resume_skills: Optional[List[str]]) -> List[str]:
+    if resume_skills is None and isinstance(resume, ResumeDoc):
+        return resume.vocab_skills
+    return resume_skills or []
+
+def _cos_to_pct(score: float) -> float:
+    pct = (score + 1) * 50.0  # map -1..1 to 0..100
     return max(0.0, min(100.0, pct))
 
-def _skill_overlap_pct(resume_skills: List[str], job_skills: List[str]) -> float:
-    s1 = set(x.lower() for x in resume_skills or [])
-    s2 = set(x.lower() for x in job_skills or [])
-    if not s1 and not s2:
-        return 0.0
-    inter = len(s1 & s2)
-    union = len(s1 | s2)
-    jacc = inter / union if union else 0.0
-    return round(jacc * 100.0, 4)
-
-def final_combine(skill_pct: float, semantic_pct: float, w_skill: float = 0.6, w_sem: float = 0.4) -> float:
+def semantic_similarity_pct(text1: str, text2: str) -> float:
+    emb1, emb2 = encode_texts([text1 or "", text2 or ""])
+    score = float(emb1 @ emb2)  # cosine of normalized vectors, -1..1
+    return _cos_to_pct(score)
+
+def final_combine(skill_pct: float, semantic_pct: float, w_skill: float = W_SKILL, w_sem: float = W_SEM) -> float:
     return float(w_skill * skill_pct + w_sem * semantic_pct)
 
-def compute_scores(resume_text: str, resume_skills: List[str], job: Dict) -> Dict:
+def _job_text(job: Dict) -> str:
     title = job.get("title", "") or ""
     desc = job.get("description", "") or ""
     company = (job.get("company") or {}).get("display_name", "") or ""
-    job_text = f"{title}\n{company}\n{desc}"
+    return f"{title}\n{company}\n{desc}"
 
-    # naive job skill extraction: reuse title+desc token scan against resume skills for display
-    # In a real setup, use the same extractor against a full skills vocabulary.
-    job_tokens = set(t.strip().lower() for t in (title + " " + desc).split())
-    job_skills = [s for s in resume_skills if s.lower().replace(" ", "") in "".join(job_tokens)]
+def _resolve_vocab(resume_skills: List[str], vocab: Optional[SkillVocabulary]) -> SkillVocabulary:
+    """skills.json when present, else an ad-hoc vocabulary of the resume's own skills."""
+    if vocab is None:
+        vocab = get_vocabulary()
+    if vocab is not None:
+        return vocab
+    return SkillVocabulary(resume_skills, get_taxonomy())
 
-    matched = sorted(set([s for s in resume_skills if s in job_skills]))
-    missing = sorted([s for s in resume_skills if s not in matched])
-
-    skill_pct = _skill_overlap_pct(resume_skills, job_skills)
-    semantic_pct = semantic_similarity_pct(resume_text, job_text)
-    final_score = final_combine(skill_pct, semantic_pct)
+def _display(vocab: SkillVocabulary, names: List[str]) -> List[str]:
+    # Vocabulary names are lowercase; show the taxonomy's canonical spelling
+    tax = vocab.taxonomy
+    return sorted({(tax.canonical(n) if tax is not None else None) or n for n in names})
 
+def _score_dict(skill_pct: float, semantic_pct: float, matched: List[str], missing: List[str]) -> Dict:
     return {
         "skill_pct": float(skill_pct),
         "semantic_pct": float(semantic_pct),
-        "final_score": float(final_score),
+        "final_score": float(final_combine(skill_pct, semantic_pct)),
         "matched_skills": matched,
         "missing_skills": missing
     }
+
+def compute_scores(resume_text: Union[str, ResumeDoc], resume_skills: Optional[List[str]], job: Dict,
+                   vocab: Optional[SkillVocabulary] = None) -> Dict:
+    result = rank_jobs(resume_text, resume_skills, [job], vocab=vocab)[0]
+    result.pop("job")
+    return result
+
+def rank_jobs(resume_text: Union[str, ResumeDoc], resume_skills: Optional[List[str]], jobs: List[Dict], top_k: Optional[int] = None,
+              vocab: Optional[SkillVocabulary] = None) -> List[Dict]:
+    """
+    Score many jobs against one resume. The resume is encoded once, uncached
+    job texts are encoded in batches, and cosine similarity is a single
+    matrix product.
+    Skill overlap is a popcount Jaccard over skill bitsets: the jobs'
+    ingest-time bitsets for the skills.json vocabulary (or `vocab`), or,
+    without one, an ad-hoc vocabulary of the resume's own skills. Jobs
+    are only read, never annotated. matched /
+    missing are the job skills the resume has / lacks, in canonical
+    spelling, and are only decoded for the returned jobs.
+    resume_text may be a ResumeDoc (its embedding is reused; resume_skills
+    None means its vocab_skills).
+    Returns compute_scores-style dicts (plus "job") sorted by final_score.
+    """
+    if not jobs:
+        return []
+    resume_skills = _resume_skills(resume_text, resume_skills)
+    resume_emb = resume_embedding(resume_text)
+    job_embs = encode_texts([_job_text(j) for j in jobs])
+    semantic = np.clip((job_embs @ resume_emb + 1) * 50.0, 0.0, 100.0)
+
+    vocab = _resolve_vocab(resume_skills, vocab)
+    resume_bits = vocab.encode(resume_skills)
+    job_bits = job_bit_matrix(jobs, vocab)
+    skill = jaccard_pct(resume_bits, job_bits)
+    final = W_SKILL * skill + W_SEM * semantic
+    order = np.argsort(-final, kind="stable")[:top_k or len(jobs)]
+
+    ranked = []
+    for i in order:
+        matched = _display(vocab, vocab.decode(job_bits[i] & resume_bits))
+        missing = _display(vocab, vocab.decode(job_bits[i] & ~resume_bits))
+        result = _score_dict(float(skill[i]), float(semantic[i]), matched, missing)
+        result["job"] = jobs[i]
+        ranked.append(result)
+    return ranked
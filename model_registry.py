@@ -0,0 +1,136 @@
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+SPACY_MODEL = "en_core_web_sm"
+
+class ModelRegistry:
+    """
+    Process-wide registry of heavy models. Each model is loaded at most once
+    per server process (guarded by a per-model lock, so concurrent Streamlit
+    sessions never load it twice) and can be warmed up in a background thread
+    at startup. status() reports readiness and load/warm-up timings.
+    """
+
+    def __init__(self):
+        self._loaders: Dict[str, Callable] = {}
+        self._warmups: Dict[str, Optional[Callable]] = {}
+        self._models: Dict[str, object] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._status: Dict[str, Dict] = {}
+        self._warmup_thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def register(self, name: str, loader: Callable, warmup: Optional[Callable] = None):
+        with self._lock:
+            self._loaders[name] = loader
+            self._warmups[name] = warmup
+            self._locks.setdefault(name, threading.Lock())
+            self._status.setdefault(name, {"state": "pending", "load_seconds": None, "warmup_seconds": None, "error": None})
+
+    def is_ready(self, name: str) -> bool:
+        return self._status.get(name, {}).get("state") == "ready"
+
+    def get(self, name: str):
+        model = self._models.get(name)
+        if model is not None:
+            return model
+        if name not in self._loaders:
+            raise KeyError(f"Unknown model {name!r}")
+        with self._locks[name]:
+            model = self._models.get(name)
+            if model is not None:
+                return model
+            status = self._status[name]
+            status.update(state="loading", error=None)
+            t0 = time.perf_counter()
+            try:
+                model = self._loaders[name]()
+            except Exception as e:
+                status.update(state="error", error=str(e))
+                raise
+            status["load_seconds"] = round(time.perf_counter() - t0, 3)
+            self._models[name] = model
+            status["state"] = "loaded"
+        return model
+
+    def warm(self, name: str):
+        model = self.get(name)
+        status = self._status[name]
+        if status["state"] == "ready":
+            return model
+        warmup = self._warmups.get(name)
+        t0 = time.perf_counter()
+        if warmup is not None:
+            try:
+                warmup(model)
+            except Exception as e:
+                status.update(state="error", error=f"warm-up failed: {e}")
+                return model
+        status["warmup_seconds"] = round(time.perf_counter() - t0, 3)
+        status["state"] = "ready"
+        return model
+
+    def warm_up(self, names: Optional[Iterable[str]] = None, background: bool = True) -> Optional[threading.Thread]:
+        """Load and warm models; the background thread is only started once per process."""
+        names = list(names or self._loaders)
+
+        def run():
+            for name in names:
+                try:
+                    self.warm(name)
+                except Exception:
+                    pass  # recorded in status
+
+        if not background:
+            run()
+            return None
+        with self._lock:
+            if self._warmup_thread is None:
+                self._warmup_thread = threading.Thread(target=run, name="model-warmup", daemon=True)
+                self._warmup_thread.start()
+            return self._warmup_thread
+
+    def status(self) -> Dict[str, Dict]:
+        return {name: dict(s) for name, s in self._status.items()}
+
+# ---------- default models ----------
+def _load_sentence_model():
+    from sentence_transformers import SentenceTransformer
+    from matcher import MODEL_NAME
+    return SentenceTransformer(MODEL_NAME)
+
+def _load_spacy():
+    import spacy
+    try:
+        return spacy.load(SPACY_MODEL)
+    except OSError:
+        from spacy.cli import download
+        download(SPACY_MODEL)
+        return spacy.load(SPACY_MODEL)
+
+registry = ModelRegistry()
+registry.register("sentence", _load_sentence_model, warmup=lambda m: m.encode(["warm up"]))
+registry.register("spacy", _load_spacy, warmup=lambda nlp: nlp("Warm up the pipeline."))
+
+DEFAULT_WARM_MODELS = ["sentence", "spacy"]
+
+def models_in_use() -> List[str]:
+    """
+    Models to warm at startup. WARM_MODELS (comma-separated registry names,
+    empty for none) overrides; by default both models the default code
+    path loads: MiniLM (matcher.rank_jobs, semantic role inference) and
+    the spaCy pipeline.
+    """
+    configured = os.getenv("WARM_MODELS")
+    if configured is not None:
+        return [n.strip() for n in configured.split(",") if n.strip() in registry._loaders]
+    return list(DEFAULT_WARM_MODELS)
+
+def start_warmup() -> Optional[threading.Thread]:
+    """Warm models_in_use() in the background; a no-op when WARM_MODELS is empty."""
+    names = models_in_use()
+    if not names:
+        return None
+    return registry.warm_up(names)
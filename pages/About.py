@@ -2,6 +2,7 @@
 
 import streamlit as st
 from ui import render_topbar
+from model_registry import registry
 
 
 def main():
@@ -44,6 +45,18 @@ You can extend this further by:
         """
     )
 
+    with st.expander("Model status"):
+        for name, status in registry.status().items():
+            load = status["load_seconds"]
+            warm = status["warmup_seconds"]
+            line = f"**{name}** — {status['state']}"
+            if load is not None:
+                line += f" (load {load:.2f}s"
+                line += f", warm-up {warm:.2f}s)" if warm is not None else ")"
+            if status["error"]:
+                line += f" — {status['error']}"
+            st.markdown(line)
+
     st.markdown("---")
     st.caption("Built as a learning project combining AI/ML, backend, and frontend skills.")
 
@@ -5,8 +5,9 @@ from datetime import datetime
 from urllib.parse import quote_plus
 
 from ui import render_topbar
-from resume_tools import extract_text_from_uploaded_file
+from resume_tools import parse_uploaded_resume
 from jobs_api_gpt import match_jobs_with_gpt
+from resume_doc import get_resume_doc
 from db import get_mongo_collection
 from save_tools import save_single_job
 
@@ -39,8 +40,16 @@ def main():
             type=["pdf", "docx", "txt", "doc"],
         )
         if uploaded_file:
+            # Cached by file hash, so reruns and re-uploads skip parsing
             with st.spinner("Reading resume..."):
-                resume_text = extract_text_from_uploaded_file(uploaded_file)
+                try:
+                    parsed = parse_uploaded_resume(uploaded_file)
+                    resume_text = parsed["text"]
+                    if parsed["status"] != "ok":
+                        st.warning(f"Parsing stopped early ({parsed['status']}); using the text read so far.")
+                except Exception as e:
+                    st.error(f"Failed to read file: {e}")
+                    resume_text = ""
             if resume_text:
                 st.success("Resume text extracted.")
                 with st.expander("Show extracted text"):
@@ -69,9 +78,13 @@ def main():
             st.error("Please upload or paste your resume first.")
             return
 
+        # One normalized view of the resume (skills, embedding, excerpts) shared
+        # by the matcher and the Learning Path / Interview Prep prompts
+        resume = get_resume_doc(resume_text)
+
         with st.spinner("Finding best job matches..."):
             result = match_jobs_with_gpt(
-                resume_text=resume_text,
+                resume_text=resume,
                 city=city,
                 experience=experience,
                 domain=domain,
@@ -6,44 +6,16 @@ import os
 
 from ui import render_topbar
 from dotenv import load_dotenv
-
-# ================= SAFE GEMINI IMPORT =================
-Client = None
-genai = None
-
-try:
-    from google.genai import Client  # new SDK
-except Exception:
-    try:
-        import google.generativeai as genai  # old SDK
-    except Exception:
-        pass
-
+from gemini_config import get_gemini
+from resume_doc import as_resume_doc
 
 # ================= ENV SETUP =================
 
+# The Gemini SDK itself is imported on first use (gemini_config.get_gemini)
 load_dotenv()
 
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 GEMINI_MODEL = os.getenv("GOOGLE_GEMINI_MODEL", "gemini-1.5-flash")
 
-client = None
-GEMINI_ERROR = None
-
-if not GEMINI_API_KEY:
-    GEMINI_ERROR = "GEMINI_API_KEY not set in environment variables."
-else:
-    try:
-        if Client:
-            client = Client(api_key=GEMINI_API_KEY)
-        elif genai:
-            genai.configure(api_key=GEMINI_API_KEY)
-            client = genai
-        else:
-            GEMINI_ERROR = "No Gemini SDK available"
-    except Exception as e:
-        GEMINI_ERROR = str(e)
-
 
 # ================= GEMINI FUNCTION =================
 
@@ -55,11 +27,13 @@ def generate_interview_questions(
     difficulty: str,
     num_questions: int,
 ):
-    if GEMINI_ERROR or not client:
-        return f"❌ Gemini error: {GEMINI_ERROR}"
+    client, new_sdk, gemini_error = get_gemini()
+    if gemini_error or not client:
+        return f"❌ Gemini error: {gemini_error}"
 
     skills_str = ", ".join(skills) if skills else "General programming"
-    resume_text = (resume_text or "")[:3000]
+    # Normalized once per resume and shared with the Home search
+    resume_text = as_resume_doc(resume_text or "").excerpt(3000)
 
     prompt = f"""
 You are an experienced technical interviewer.
@@ -78,7 +52,7 @@ FORMAT IN MARKDOWN ONLY.
 """
 
     try:
-        if Client:
+        if new_sdk:
             response = client.models.generate_content(
                 model=GEMINI_MODEL,
                 contents=prompt,
@@ -8,44 +8,16 @@ import os
 from ui import render_topbar
 from db import get_collection
 from dotenv import load_dotenv
-
-# ================= SAFE GEMINI IMPORT =================
-Client = None
-genai = None
-
-try:
-    from google.genai import Client  # new SDK
-except Exception:
-    try:
-        import google.generativeai as genai  # old SDK
-    except Exception:
-        pass
-
+from gemini_config import get_gemini
+from resume_doc import as_resume_doc
 
 # ================= ENV SETUP =================
 
+# The Gemini SDK itself is imported on first use (gemini_config.get_gemini)
 load_dotenv()
 
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 GEMINI_MODEL = os.getenv("GOOGLE_GEMINI_MODEL", "gemini-1.5-flash")
 
-client = None
-GEMINI_ERROR = None
-
-if not GEMINI_API_KEY:
-    GEMINI_ERROR = "GEMINI_API_KEY not set in environment variables."
-else:
-    try:
-        if Client:
-            client = Client(api_key=GEMINI_API_KEY)
-        elif genai:
-            genai.configure(api_key=GEMINI_API_KEY)
-            client = genai
-        else:
-            GEMINI_ERROR = "No Gemini SDK available"
-    except Exception as e:
-        GEMINI_ERROR = str(e)
-
 
 # ================= GEMINI FUNCTION =================
 
@@ -55,13 +27,15 @@ def generate_learning_path(missing_skills, target_role, experience, resume_text)
     Returns Markdown text.
     """
 
-    if GEMINI_ERROR or not client:
-        return f"❌ Gemini error: {GEMINI_ERROR}"
+    client, new_sdk, gemini_error = get_gemini()
+    if gemini_error or not client:
+        return f"❌ Gemini error: {gemini_error}"
 
     if not missing_skills:
         return "No missing skills selected."
 
-    resume_text = (resume_text or "")[:3000]
+    # Normalized once per resume and shared with the Home search
+    resume_text = as_resume_doc(resume_text or "").excerpt(3000)
     skills_list = ", ".join(missing_skills)
 
     prompt = f"""
@@ -88,7 +62,7 @@ Your task:
 """
 
     try:
-        if Client:
+        if new_sdk:
             response = client.models.generate_content(
                 model=GEMINI_MODEL,
                 contents=prompt,
@@ -195,8 +169,9 @@ you were missing in your last job search.
 
     st.subheader("📘 Generate Learning Path")
 
-    if GEMINI_ERROR:
-        st.error(GEMINI_ERROR)
+    gemini_error = get_gemini()[2]
+    if gemini_error:
+        st.error(gemini_error)
         return
 
     if st.button("✨ Generate Learning Path with AI"):
@@ -221,7 +196,7 @@ you were missing in your last job search.
                         "skills": selected_skills,
                         "target_role": target_role,
                         "experience": experience,
-                        "resume_excerpt": resume_text[:1000],
+                        "resume_excerpt": as_resume_doc(resume_text).excerpt(1000),
                         "roadmap_md": roadmap_md,
                         "created_at": datetime.utcnow(),
                     }
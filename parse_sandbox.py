@@ -0,0 +1,168 @@
+"""
+Isolated resume parsing. PDF/DOCX extraction runs in a small pool of warm
+worker processes; each parse gets a wall-clock timeout and an RSS ceiling.
+A worker that overruns either is killed (and replaced in the background),
+and the caller gets whatever pages were extracted before that point.
+"""
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from typing import Dict, Optional
+
+PARSE_TIMEOUT = float(os.getenv("RESUME_PARSE_TIMEOUT", "20"))
+PARSE_MAX_RSS_MB = int(os.getenv("RESUME_PARSE_MAX_RSS_MB", "512"))
+SANDBOX_WORKERS = int(os.getenv("RESUME_SANDBOX_WORKERS", "2"))
+_POLL_SECONDS = 0.05
+_RESPAWN_BACKOFF = (1.0, 2.0, 5.0, 10.0, 30.0)  # seconds between attempts to replace a dead worker
+
+log = logging.getLogger(__name__)
+
+def _worker_main(conn):
+    # Import parsers once per worker so warm workers parse immediately
+    import resume_parser
+    resume_parser._pdfplumber()
+    while True:
+        try:
+            msg = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            return
+        kind, data, max_pages, max_chars = msg
+        try:
+            if kind == "pdf":
+                total = 0
+                for i, page_text in enumerate(resume_parser.iter_pdf_pages(data)):
+                    if i >= max_pages or total >= max_chars:
+                        break
+                    if page_text:
+                        conn.send(("chunk", page_text + "\n"))
+                        total += len(page_text) + 1
+            else:
+                conn.send(("chunk", resume_parser.extract_text_from_docx(data)))
+            conn.send(("done", None))
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+
+def _rss_bytes(pid: int) -> Optional[int]:
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None  # not Linux: only the timeout applies
+
+class _Worker:
+    def __init__(self, ctx):
+        self.conn, child = ctx.Pipe()
+        self.proc = ctx.Process(target=_worker_main, args=(child,), daemon=True, name="resume-parse")
+        self.proc.start()
+        child.close()
+
+    def kill(self):
+        try:
+            self.proc.kill()
+            self.proc.join(timeout=1)
+        finally:
+            self.conn.close()
+
+class ParseSandbox:
+    def __init__(self, workers: int = SANDBOX_WORKERS):
+        self._ctx = multiprocessing.get_context("spawn")
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._size = max(1, workers)
+        self._started = False
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Spawn the warm workers (idempotent)."""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        for _ in range(self._size):
+            self._idle.put(_Worker(self._ctx))
+
+    def _replace(self, worker: _Worker):
+        worker.kill()
+        threading.Thread(target=self._respawn, daemon=True, name="resume-parse-respawn").start()
+
+    def _respawn(self):
+        # Keep the pool at full size: a failed spawn is logged and retried, never dropped
+        attempt = 0
+        while True:
+            try:
+                self._idle.put(_Worker(self._ctx))
+                return
+            except Exception:
+                delay = _RESPAWN_BACKOFF[min(attempt, len(_RESPAWN_BACKOFF) - 1)]
+                log.exception("resume parse worker respawn failed (attempt %d), retrying in %.0fs", attempt + 1, delay)
+                attempt += 1
+                time.sleep(delay)
+
+    def parse(self, data: bytes, kind: str, timeout: float = PARSE_TIMEOUT, max_rss_mb: int = PARSE_MAX_RSS_MB,
+              max_pages: Optional[int] = None, max_chars: Optional[int] = None) -> Dict:
+        """
+        Returns {"text", "status", "seconds"}; status is "ok", "timeout",
+        "memory" (RSS ceiling hit), "error" or "crashed". Text is partial
+        unless status is "ok".
+        """
+        from resume_parser import MAX_PDF_PAGES, MAX_TEXT_CHARS
+
+        self.start()
+        t0 = time.monotonic()
+        deadline = t0 + timeout
+        try:
+            worker = self._idle.get(timeout=timeout)
+        except queue.Empty:
+            return {"text": "", "status": "timeout", "seconds": timeout}
+        max_chars = max_chars or MAX_TEXT_CHARS
+        chunks = []
+        status = None
+        try:
+            worker.conn.send((kind, data, max_pages or MAX_PDF_PAGES, max_chars))
+            while status is None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    status = "timeout"
+                    break
+                got = worker.conn.poll(min(_POLL_SECONDS, remaining))
+                if got:
+                    msg, payload = worker.conn.recv()
+                    if msg == "chunk":
+                        chunks.append(payload)
+                    elif msg == "done":
+                        status = "ok"
+                    else:
+                        status = "error"
+                    if status is not None:
+                        break
+                # RSS is checked on every iteration, so a worker streaming chunks is watched too
+                rss = _rss_bytes(worker.proc.pid)
+                if rss is not None and rss > max_rss_mb * 1024 * 1024:
+                    status = "memory"
+                elif not got and not worker.proc.is_alive():
+                    status = "crashed"
+        except (EOFError, OSError):
+            status = "crashed"
+        finally:
+            if status in ("ok", "error"):
+                self._idle.put(worker)
+            else:
+                self._replace(worker)
+        text = "".join(chunks)[:max_chars]
+        return {"text": text, "status": status, "seconds": round(time.monotonic() - t0, 3)}
+
+_sandbox: Optional[ParseSandbox] = None
+_sandbox_lock = threading.Lock()
+
+def get_sandbox() -> ParseSandbox:
+    global _sandbox
+    with _sandbox_lock:
+        if _sandbox is None:
+            _sandbox = ParseSandbox()
+        return _sandbox
+
+def parse_isolated(data: bytes, kind: str, **kwargs) -> Dict:
+    """kind is "pdf" or "docx"; see ParseSandbox.parse for kwargs and result."""
+    return get_sandbox().parse(data, kind, **kwargs)
@@ -0,0 +1,47 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+STORAGE_MODES = ("float32", "float16", "int8")
+DOT_CHUNK_ROWS = 1024  # keeps the widened chunk in cache
+
+def storage_dtype(mode: str):
+    if mode not in STORAGE_MODES:
+        raise ValueError(f"Unknown storage mode {mode!r}; expected one of {STORAGE_MODES}")
+    return {"float32": np.float32, "float16": np.float16, "int8": np.int8}[mode]
+
+def quantize(vecs: np.ndarray, mode: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Encode float vectors for storage. Returns (data, scales); scales is only
+    set for int8, where row i decodes as data[i] * scales[i].
+    """
+    vecs = np.asarray(vecs, dtype=np.float32)
+    if mode == "int8":
+        scales = np.abs(vecs).max(axis=-1) / 127.0
+        scales = np.where(scales > 0, scales, 1.0).astype(np.float32)
+        data = np.rint(vecs / scales[..., None]).astype(np.int8)
+        return data, scales
+    return vecs.astype(storage_dtype(mode)), None
+
+def dequantize(data: np.ndarray, scales: Optional[np.ndarray] = None) -> np.ndarray:
+    out = data.astype(np.float32)
+    if scales is not None:
+        out *= scales[..., None]
+    return out
+
+def quantized_dot(data: np.ndarray, scales: Optional[np.ndarray], query: np.ndarray) -> np.ndarray:
+    """
+    data @ query straight from the stored form. Rows are widened to float32
+    one chunk at a time so BLAS can be used without materializing the whole
+    matrix; int8 scores are rescaled per row afterwards.
+    """
+    query = np.asarray(query, dtype=np.float32)
+    if data.dtype == np.float32:
+        return data @ query
+    out = np.empty(len(data), dtype=np.float32)
+    for start in range(0, len(data), DOT_CHUNK_ROWS):
+        stop = start + DOT_CHUNK_ROWS
+        out[start:stop] = data[start:stop].astype(np.float32) @ query
+    if scales is not None:
+        out *= scales
+    return out
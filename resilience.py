@@ -0,0 +1,218 @@
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Optional, TypeVar
+
+T = TypeVar("T")
+
+class CircuitOpenError(RuntimeError):
+    pass
+
+def is_retryable(exc: BaseException) -> bool:
+    """Network errors, timeouts, 429 and 5xx are retryable; other HTTP 4xx are not."""
+    status = getattr(getattr(exc, "response", None), "status_code", None)
+    if status is None:
+        # Parse / programming errors will not go away on retry
+        return not isinstance(exc, (ValueError, KeyError, TypeError))
+    return status == 429 or status >= 500
+
+def upstream_answered(exc: BaseException) -> bool:
+    """A non-retryable HTTP error (e.g. 404 for an unknown slug): the upstream itself is healthy."""
+    status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status is not None and not is_retryable(exc)
+
+class CircuitBreaker:
+    """
+    closed -> open after `failure_threshold` consecutive failures; one trial
+    call after `reset_timeout`. A trial that reports neither success nor
+    failure within `trial_timeout` is considered lost and another is allowed.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0, trial_timeout: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.trial_timeout = trial_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_started = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            if (self.state == "open" and now - self.opened_at >= self.reset_timeout) or (
+                self.state == "half_open" and now - self.trial_started >= self.trial_timeout
+            ):
+                self.state = "half_open"
+                self.trial_started = now
+                return True
+            return self.state == "closed"
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+class RetryBudget:
+    """Each call earns `ratio` retry tokens (capped); a retry spends one, so retries stay a bounded share of traffic."""
+
+    def __init__(self, ratio: float = 0.2, max_tokens: float = 10.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        with self._lock:
+            self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self.tokens >= 1.0:
+                self.tokens -= 1.0
+                return True
+            return False
+
+class LatencyStats:
+    def __init__(self, window: int = 200):
+        self.samples: deque = deque(maxlen=window)
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.hedges = 0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float, ok: bool):
+        with self._lock:
+            self.calls += 1
+            if ok:
+                self.samples.append(seconds)
+            else:
+                self.errors += 1
+
+    def incr(self, name: str):
+        """Bump a counter ("retries", "hedges"); hedge and fan-out threads share one LatencyStats."""
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def percentile(self, q: float) -> Optional[float]:
+        with self._lock:
+            data = sorted(self.samples)
+        if not data:
+            return None
+        return data[min(len(data) - 1, int(q * len(data)))]
+
+    def snapshot(self) -> Dict:
+        p50, p95, p99 = (self.percentile(q) for q in (0.5, 0.95, 0.99))
+        with self._lock:
+            counts = {"calls": self.calls, "errors": self.errors, "retries": self.retries, "hedges": self.hedges}
+        return {
+            **counts,
+            "p50_ms": None if p50 is None else round(p50 * 1000, 1),
+            "p95_ms": None if p95 is None else round(p95 * 1000, 1),
+            "p99_ms": None if p99 is None else round(p99 * 1000, 1),
+        }
+
+_hedge_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="hedge")
+
+class SourceGuard:
+    """
+    Resilience wrapper for one upstream source: circuit breaker, retries with
+    exponential backoff + jitter drawn from a retry budget, and optional
+    hedging (a second identical request once the first exceeds the observed
+    p95 latency; first success wins).
+    """
+
+    def __init__(self, name: str, max_retries: int = 2, backoff: float = 0.5, max_backoff: float = 4.0,
+                 hedge: bool = False, hedge_min_samples: int = 20,
+                 retryable: Callable[[BaseException], bool] = is_retryable):
+        self.name = name
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.hedge = hedge
+        self.hedge_min_samples = hedge_min_samples
+        self.retryable = retryable
+        self.breaker = CircuitBreaker()
+        self.budget = RetryBudget()
+        self.stats = LatencyStats()
+
+    def _attempt(self, fn: Callable[[], T]) -> T:
+        p95 = self.stats.percentile(0.95) if self.hedge and len(self.stats.samples) >= self.hedge_min_samples else None
+        if p95 is None:
+            return fn()
+        first = _hedge_pool.submit(fn)
+        done, _ = wait([first], timeout=p95)
+        if done:
+            return first.result()
+        self.stats.incr("hedges")
+        pending = {first, _hedge_pool.submit(fn)}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                if fut.exception() is None:
+                    return fut.result()
+                error = fut.exception()
+        raise error
+
+    def call(self, fn: Callable[[], T]) -> T:
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"{self.name}: circuit open, skipping source")
+        self.budget.deposit()
+        attempt = 0
+        while True:
+            t0 = time.perf_counter()
+            try:
+                result = self._attempt(fn)
+            except Exception as e:
+                self.stats.record(time.perf_counter() - t0, ok=False)
+                retryable = self.retryable(e)
+                if not retryable and upstream_answered(e):
+                    self.breaker.record_success()
+                elif retryable or self.breaker.state == "half_open":
+                    # A half-open trial must always resolve the breaker
+                    self.breaker.record_failure()
+                if not retryable or attempt >= self.max_retries or not self.breaker.allow() or not self.budget.withdraw():
+                    raise
+                attempt += 1
+                self.stats.incr("retries")
+                delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+                time.sleep(delay * random.uniform(0.5, 1.0))
+                continue
+            self.stats.record(time.perf_counter() - t0, ok=True)
+            self.breaker.record_success()
+            return result
+
+    def status(self) -> Dict:
+        return {
+            "breaker": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            "retry_tokens": round(self.budget.tokens, 2),
+            **self.stats.snapshot(),
+        }
+
+_guards: Dict[str, SourceGuard] = {}
+_guards_lock = threading.Lock()
+
+def get_guard(name: str, **kwargs) -> SourceGuard:
+    with _guards_lock:
+        if name not in _guards:
+            _guards[name] = SourceGuard(name, **kwargs)
+        return _guards[name]
+
+def health() -> Dict[str, Dict]:
+    """Breaker state and latency stats for every source seen so far."""
+    with _guards_lock:
+        guards = list(_guards.values())
+    return {g.name: g.status() for g in guards}
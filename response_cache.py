@@ -0,0 +1,148 @@
+import hashlib
+import json
+import os
+import pathlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+DEFAULT_TTL = float(os.getenv("JOBS_CACHE_TTL", "900"))
+DEFAULT_STALE = float(os.getenv("JOBS_CACHE_STALE", "3600"))
+
+def normalize_params(params: Dict) -> Dict:
+    out = {}
+    for k, v in sorted(params.items()):
+        if v is None:
+            continue
+        if isinstance(v, str):
+            v = " ".join(v.lower().split())
+        out[str(k)] = v
+    return out
+
+def make_key(source: str, params: Dict) -> str:
+    blob = json.dumps([source, normalize_params(params)], sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+class ResponseCache:
+    """
+    TTL cache for job API responses keyed on (source, normalized params).
+    - fresh  (age < ttl): served from cache
+    - stale  (age < ttl + stale_ttl): served from cache immediately while one
+      background refresh per key re-fetches it
+    - older / missing: fetched synchronously
+    Memory tier is an LRU of `max_items`; the optional disk tier keeps one
+    JSON file per key under `path`, trimmed to `max_disk_items` oldest-first.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TTL, stale_ttl: float = DEFAULT_STALE, max_items: int = 256,
+                 path: Optional[str] = os.getenv("JOBS_CACHE_DIR"), max_disk_items: int = 2000):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_items = max_items
+        self.max_disk_items = max_disk_items
+        self._dir = pathlib.Path(path) if path else None
+        self._mem: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="cache-refresh")
+        self.stats = {"fresh": 0, "stale": 0, "miss": 0, "refresh_errors": 0}
+
+    # ---------- tiers ----------
+    def _disk_path(self, key: str) -> pathlib.Path:
+        return self._dir / f"{key}.json"
+
+    def _lookup(self, key: str) -> Optional[Tuple[float, Any]]:
+        with self._lock:
+            entry = self._mem.get(key)
+            if entry is not None:
+                self._mem.move_to_end(key)
+                return entry
+        if self._dir is None:
+            return None
+        try:
+            data = json.loads(self._disk_path(key).read_text(encoding="utf-8"))
+            entry = (float(data["stored_at"]), data["value"])
+        except Exception:
+            return None
+        self._store_mem(key, entry)
+        return entry
+
+    def _store_mem(self, key: str, entry: Tuple[float, Any]):
+        with self._lock:
+            self._mem[key] = entry
+            self._mem.move_to_end(key)
+            while len(self._mem) > self.max_items:
+                self._mem.popitem(last=False)
+
+    def _store(self, key: str, value: Any):
+        entry = (time.time(), value)
+        self._store_mem(key, entry)
+        if self._dir is None:
+            return
+        try:
+            self._dir.mkdir(parents=True, exist_ok=True)
+            tmp = self._disk_path(key).with_suffix(".tmp")
+            tmp.write_text(json.dumps({"stored_at": entry[0], "value": value}), encoding="utf-8")
+            os.replace(tmp, self._disk_path(key))
+            self._trim_disk()
+        except (OSError, TypeError, ValueError):
+            pass
+
+    def _trim_disk(self):
+        files = list(self._dir.glob("*.json"))
+        if len(files) <= self.max_disk_items:
+            return
+        files.sort(key=lambda f: f.stat().st_mtime)
+        for f in files[:len(files) - self.max_disk_items]:
+            f.unlink(missing_ok=True)
+
+    # ---------- refresh ----------
+    def _refresh(self, key: str, fetch: Callable[[], Any]):
+        try:
+            self._store(key, fetch())
+        except Exception:
+            self.stats["refresh_errors"] += 1
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _schedule_refresh(self, key: str, fetch: Callable[[], Any]):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        self._pool.submit(self._refresh, key, fetch)
+
+    # ---------- public API ----------
+    def get_or_fetch(self, source: str, params: Dict, fetch: Callable[[], Any]) -> Any:
+        key = make_key(source, params)
+        entry = self._lookup(key)
+        if entry is not None:
+            age = time.time() - entry[0]
+            if age < self.ttl:
+                self.stats["fresh"] += 1
+                return entry[1]
+            if age < self.ttl + self.stale_ttl:
+                self.stats["stale"] += 1
+                self._schedule_refresh(key, fetch)
+                return entry[1]
+        self.stats["miss"] += 1
+        value = fetch()
+        self._store(key, value)
+        return value
+
+    def invalidate(self, source: str, params: Dict):
+        key = make_key(source, params)
+        with self._lock:
+            self._mem.pop(key, None)
+        if self._dir is not None:
+            self._disk_path(key).unlink(missing_ok=True)
+
+    def clear(self):
+        with self._lock:
+            self._mem.clear()
+        if self._dir is not None and self._dir.exists():
+            for f in self._dir.glob("*.json"):
+                f.unlink(missing_ok=True)
@@ -0,0 +1,167 @@
+import hashlib
+import os
+import re
+from functools import cached_property, lru_cache
+from typing import TYPE_CHECKING, Dict, List, Optional, Set
+
+if TYPE_CHECKING:  # numpy / rapidfuzz stay out of the Gemini pages' import path
+    import numpy as np
+
+RESUME_DOC_CACHE = 32
+PROMPT_CHARS = 3000
+
+# Headings recognised on a line of their own, by section
+SECTION_HEADINGS = {
+    "summary": ("summary", "profile", "professional summary", "objective", "career objective", "about me"),
+    "experience": ("experience", "work experience", "professional experience", "employment",
+                   "employment history", "work history", "internships", "internship"),
+    "education": ("education", "academic background", "qualifications", "academics"),
+    "skills": ("skills", "technical skills", "key skills", "core competencies", "technologies", "tech stack"),
+    "projects": ("projects", "personal projects", "academic projects", "key projects"),
+    "certifications": ("certifications", "certificates", "licenses", "courses"),
+    "achievements": ("achievements", "awards", "honors", "accomplishments"),
+}
+_HEADING_TO_SECTION = {h: name for name, heads in SECTION_HEADINGS.items() for h in heads}
+# Order sections are packed into a prompt excerpt when the whole text does not fit
+EXCERPT_SECTIONS = ("skills", "experience", "projects", "summary", "certifications", "education", "achievements")
+_MIN_PARTIAL = 200  # smallest tail of a section worth cutting into an excerpt
+
+_SPACES_RE = re.compile(r"[ \t\f\v\u00a0]+")
+
+
+class ResumeDoc:
+    """
+    One resume, normalized once and shared by every consumer of a search:
+    role inference, job ranking and the Gemini prompt builders. Each view
+    (tokens, n-grams, sections, skills, embedding, excerpts) is computed on first
+    access and memoized on the instance; the fuzzy skill matcher works off
+    the same tokens and n-grams. Get instances through
+    get_resume_doc() so reruns and other pages reuse the same object.
+    """
+
+    def __init__(self, text: str):
+        self.raw = text or ""
+        self._ngrams: Dict[int, List[str]] = {}
+        self._excerpts: Dict[int, str] = {}
+
+    def __repr__(self) -> str:
+        return f"ResumeDoc({self.digest[:12]}, {len(self.text)} chars)"
+
+    @cached_property
+    def digest(self) -> str:
+        return hashlib.sha256(self.raw.encode("utf-8", errors="ignore")).hexdigest()
+
+    @cached_property
+    def text(self) -> str:
+        """Whitespace-normalized text: spaces collapsed per line, blank lines dropped."""
+        lines = (_SPACES_RE.sub(" ", line).strip() for line in self.raw.splitlines())
+        return "\n".join(line for line in lines if line)
+
+    @cached_property
+    def lower(self) -> str:
+        return self.text.lower()
+
+    @cached_property
+    def tokens(self) -> List[str]:
+        from skill_matcher import tokenize_for_windows
+
+        return tokenize_for_windows(self.lower)
+
+    def ngrams(self, n: int) -> List[str]:
+        """Space-joined token n-grams, in order (duplicates kept)."""
+        if n not in self._ngrams:
+            from skill_matcher import token_ngrams
+
+            self._ngrams[n] = token_ngrams(self.tokens, n)
+        return self._ngrams[n]
+
+    @cached_property
+    def sections(self) -> Dict[str, str]:
+        """Text under each recognised heading; anything before the first one is "header"."""
+        sections: Dict[str, List[str]] = {}
+        current = "header"
+        for line in self.text.split("\n"):
+            key = line.strip(" :•-").lower()
+            if len(key) <= 40 and key in _HEADING_TO_SECTION:
+                current = _HEADING_TO_SECTION[key]
+                sections.setdefault(current, [])
+                continue
+            sections.setdefault(current, []).append(line)
+        return {name: "\n".join(lines) for name, lines in sections.items()}
+
+    @cached_property
+    def skills(self) -> Set[str]:
+        """Display-name skills used for role inference (jobs_api_gpt)."""
+        from jobs_api_gpt import skills_in_text
+
+        return skills_in_text(self.lower)
+
+    @cached_property
+    def vocab_skills(self) -> List[str]:
+        """skills.json vocabulary hits, the form matcher.rank_jobs expects."""
+        from skill_matcher import extract_skills_from_text, load_skills
+
+        if not os.path.exists("skills.json"):
+            return []
+        return extract_skills_from_text(self.lower, load_skills(), tokens=self.tokens, ngrams=self.ngrams)
+
+    @cached_property
+    def embedding(self) -> "np.ndarray":
+        """Normalized MiniLM vector of the full text (served from the embedding cache when warm)."""
+        from matcher import encode_texts
+
+        return encode_texts([self.text])[0]
+
+    def excerpt(self, max_chars: int = PROMPT_CHARS) -> str:
+        """
+        Prompt-sized view of the normalized text. A resume that does not fit
+        is packed section by section (EXCERPT_SECTIONS order), so skills and
+        experience are not crowded out by a long header; without recognised
+        sections it is a prefix. Cuts land on word boundaries.
+        """
+        if max_chars not in self._excerpts:
+            if len(self.text) <= max_chars:
+                cut = self.text
+            else:
+                cut = self._pack_sections(max_chars) or _cut_words(self.text, max_chars)
+            self._excerpts[max_chars] = cut
+        return self._excerpts[max_chars]
+
+    def _pack_sections(self, max_chars: int) -> str:
+        parts: List[str] = []
+        left = max_chars
+        for name in EXCERPT_SECTIONS:
+            body = self.sections.get(name)
+            if not body:
+                continue
+            block = f"{name.title()}:\n{body}"
+            sep = 2 if parts else 0
+            if len(block) + sep <= left:
+                parts.append(block)
+                left -= len(block) + sep
+                continue
+            if left - sep >= _MIN_PARTIAL:
+                parts.append(_cut_words(block, left - sep))
+            break
+        return "\n\n".join(parts)
+
+
+def _cut_words(text: str, max_chars: int) -> str:
+    cut = text[:max_chars]
+    if len(text) > max_chars:
+        space = cut.rfind(" ", max_chars // 2)
+        cut = cut[:space] if space > 0 else cut
+    return cut
+
+
+@lru_cache(maxsize=RESUME_DOC_CACHE)
+def get_resume_doc(text: str) -> ResumeDoc:
+    """Shared ResumeDoc for a resume text (most recently used docs are kept)."""
+    return ResumeDoc(text)
+
+
+def as_resume_doc(resume) -> Optional[ResumeDoc]:
+    """Accept a ResumeDoc or raw text; None stays None."""
+    if resume is None or isinstance(resume, ResumeDoc):
+        return resume
+    return get_resume_doc(resume)
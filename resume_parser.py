@@ -1,61 +1,190 @@
 import io
+import multiprocessing
+import os
 import re
-import docx
-import spacy 
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Iterator, List, Optional, Union
 
-# Load spaCy English model once
-
-
-_nlp = None
+from model_registry import registry
 
+# spaCy English model is loaded once per process (and warmed at startup) by the registry
 def get_nlp():
-    global _nlp
-    if _nlp is None:
-        try:
-            _nlp = spacy.load("en_core_web_sm")
-        except OSError:
-            from spacy.cli import download
-            download("en_core_web_sm")
-            _nlp = spacy.load("en_core_web_sm")
-    return _nlp
+    return registry.get("spacy")
 
 EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
 PHONE_RE = re.compile(r"(\+?\d[\d\-\s]{7,}\d)")
 
-try:
-    import pdfplumber
-    PDFPLUMBER_AVAILABLE = True
-except Exception:
-    PDFPLUMBER_AVAILABLE = False
+# Upload limits and PDF fan-out; big CVs are truncated instead of dominating latency
+MAX_PDF_PAGES = int(os.getenv("RESUME_MAX_PAGES", "30"))
+MAX_TEXT_CHARS = int(os.getenv("RESUME_MAX_CHARS", "100000"))
+PDF_WORKERS = int(os.getenv("RESUME_PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+# The pool only pays for its IPC and per-worker file open on long, slow
+# documents: both a page count and an estimated sequential time (from the
+# first page) must clear these bars
+PARALLEL_MIN_PAGES = 12
+PARALLEL_MIN_SECONDS = 0.5
+
+# Parser libraries are imported on first use so importing this module stays cheap
+@lru_cache(maxsize=1)
+def _pdfplumber():
+    try:
+        import pdfplumber
+        return pdfplumber
+    except Exception:
+        return None
+
+def _pdf_reader(source: Union[bytes, str]):
+    from PyPDF2 import PdfReader   # fallback
+    return PdfReader(io.BytesIO(source) if isinstance(source, bytes) else source)
+
+def _docx_document(file_bytes: bytes):
+    import docx
+    return docx.Document(io.BytesIO(file_bytes))
+
+def _open_plumber(source: Union[bytes, str]):
+    """pdfplumber document for PDF bytes or a file path; None if unavailable or unreadable."""
+    pdfplumber = _pdfplumber()
+    if pdfplumber is None:
+        return None
+    try:
+        return pdfplumber.open(io.BytesIO(source) if isinstance(source, bytes) else source)  # type: ignore
+    except Exception:
+        return None
+
+def iter_pdf_pages(source: Union[bytes, str], start: int = 0, stop: Optional[int] = None, pdf=None) -> Iterator[str]:
+    """
+    Text of pages [start, stop) of PDF bytes or a file path, one page at a
+    time. Each page is read with pdfplumber and only that page falls back
+    to PyPDF2 when it yields nothing, so the document is never parsed twice
+    end to end. An already open pdfplumber `pdf` is reused (and left open).
+    """
+    owned = pdf is None
+    if owned:
+        pdf = _open_plumber(source)
+    reader = None
+    try:
+        if stop is None:
+            stop = len(pdf.pages) if pdf is not None else len(_pdf_reader(source).pages)
+        for i in range(start, stop):
+            page_text = ""
+            if pdf is not None:
+                try:
+                    page_text = pdf.pages[i].extract_text() or ""
+                except Exception:
+                    page_text = ""
+            if not page_text.strip():
+                try:
+                    reader = reader or _pdf_reader(source)
+                    page_text = reader.pages[i].extract_text() or ""
+                except Exception:
+                    page_text = ""
+            yield page_text
+    finally:
+        if owned and pdf is not None:
+            pdf.close()
+
+def _extract_pdf_pages(source: Union[bytes, str], start: int, stop: int, max_chars: Optional[int] = None,
+                       pdf=None) -> List[str]:
+    """Pages [start, stop) as a list; stops early once max_chars is reached."""
+    texts: List[str] = []
+    total = 0
+    for page_text in iter_pdf_pages(source, start, stop, pdf):
+        texts.append(page_text)
+        total += len(page_text)
+        if max_chars is not None and total >= max_chars:
+            break
+    return texts
 
-from PyPDF2 import PdfReader   # fallback
+_pdf_pool: Optional[ProcessPoolExecutor] = None
+_pdf_pool_lock = threading.Lock()
 
-def extract_text_from_pdf(file_bytes: bytes) -> str:
-    text = ""
-    if PDFPLUMBER_AVAILABLE:
+def _get_pdf_pool() -> ProcessPoolExecutor:
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is None:
+            # spawn, not fork: the Streamlit server process is multi-threaded
+            _pdf_pool = ProcessPoolExecutor(max_workers=PDF_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pdf_pool
+
+def _discard_pdf_pool(pool: ProcessPoolExecutor):
+    # A worker died (e.g. OOM on a hostile PDF): drop the broken pool so the next call builds a fresh one
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is pool:
+            _pdf_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def _extract_pdf_parallel(file_bytes: bytes, start: int, n_pages: int, max_chars: int) -> Optional[List[str]]:
+    """
+    Pages [start, n_pages) across the pool: the bytes are written once to a temp
+    file and each worker gets a path and one contiguous page range, so it
+    opens the file once and nothing large is pickled per task. None if the
+    pool broke (the caller falls back to the sequential path).
+    """
+    step = -(-(n_pages - start) // PDF_WORKERS)
+    ranges = [(lo, min(lo + step, n_pages)) for lo in range(start, n_pages, step)]
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(file_bytes)
+        pool = _get_pdf_pool()
         try:
-            with pdfplumber.open(io.BytesIO(file_bytes)) as pdf:  # type: ignore
-                for page in pdf.pages:
-                    page_text = page.extract_text() or ""
-                    if page_text:
-                        text += page_text + "\n"
-            if text.strip():
-                return text
-        except Exception:
+            futures = [pool.submit(_extract_pdf_pages, path, lo, hi, max_chars) for lo, hi in ranges]
+            return [t for fut in futures for t in fut.result()]
+        except BrokenProcessPool:
+            _discard_pdf_pool(pool)
+            return None
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
             pass
-    # fallback to PyPDF2
-    reader = PdfReader(io.BytesIO(file_bytes))
-    for page in reader.pages:
-        page_text = page.extract_text() or ""
-        if page_text:
-            text += page_text + "\n"
-    return text
+
+def extract_text_from_pdf(
+    file_bytes: bytes,
+    max_pages: int = MAX_PDF_PAGES,
+    max_chars: int = MAX_TEXT_CHARS,
+    parallel: bool = True,
+) -> str:
+    # One open serves the page count, the first page (timed to estimate the
+    # rest) and, unless the pool takes over, the remaining pages
+    pdf = _open_plumber(file_bytes)
+    try:
+        total = len(pdf.pages) if pdf is not None else len(_pdf_reader(file_bytes).pages)
+        n_pages = min(total, max_pages)
+        t0 = time.perf_counter()
+        pages = _extract_pdf_pages(file_bytes, 0, min(1, n_pages), max_chars, pdf)
+        first_seconds = time.perf_counter() - t0
+        left = max_chars - sum(len(t) for t in pages)
+        rest = None
+        if (parallel and PDF_WORKERS > 1 and n_pages >= PARALLEL_MIN_PAGES and left > 0
+                and first_seconds * (n_pages - 1) >= PARALLEL_MIN_SECONDS):
+            rest = _extract_pdf_parallel(file_bytes, 1, n_pages, left)
+        if rest is None and left > 0:
+            rest = _extract_pdf_pages(file_bytes, 1, n_pages, left, pdf)
+        pages += rest or []
+    finally:
+        if pdf is not None:
+            pdf.close()
+
+    text = "".join(t + "\n" for t in pages if t)
+    return text[:max_chars]
 
 def extract_text_from_docx(file_bytes: bytes) -> str:
-    document = docx.Document(io.BytesIO(file_bytes))
+    document = _docx_document(file_bytes)
     return "\n".join(p.text for p in document.paragraphs)
 
-def extract_text_file(file_obj) -> str:
+def extract_text_file(file_obj, isolated: bool = False) -> str:
+    """
+    isolated=True parses PDF/DOCX in a sandboxed worker process with a
+    wall-clock timeout and RSS ceiling (see parse_sandbox); on timeout the
+    pages extracted so far are returned.
+    """
     # Streamlit UploadedFile provides .type and .read()
     data = file_obj.read()
     # Reset pointer for potential re-use by caller
@@ -65,7 +194,11 @@ def extract_text_file(file_obj) -> str:
         except Exception:
             pass
     name = getattr(file_obj, "name", "").lower()
-    if name.endswith(".pdf") or getattr(file_obj, "type", "") == "application/pdf":
+    is_pdf = name.endswith(".pdf") or getattr(file_obj, "type", "") == "application/pdf"
+    if isolated and (is_pdf or name.endswith(".docx") or name.endswith(".doc")):
+        from parse_sandbox import parse_isolated
+        return parse_isolated(data, "pdf" if is_pdf else "docx")["text"]
+    if is_pdf:
         return extract_text_from_pdf(data)
     elif name.endswith(".docx") or name.endswith(".doc"):
         return extract_text_from_docx(data)
@@ -1,32 +1,107 @@
 # resume_tools.py
 from __future__ import annotations
-import io
+import hashlib
+import os
 
 import streamlit as st
 
-def extract_text_from_uploaded_file(uploaded_file) -> str:
+from resume_parser import extract_contact_info, extract_text_from_docx, extract_text_from_pdf
+
+RESUME_CACHE_ENTRIES = 128
+# Parse uploads in the sandboxed worker pool (timeout + memory ceiling)
+ISOLATED_PARSING = os.getenv("RESUME_ISOLATED", "0") == "1"
+
+
+def start_parse_sandbox() -> None:
+    """Spawn the sandbox's warm workers at startup, so the first upload does not pay for it."""
+    if ISOLATED_PARSING:
+        from parse_sandbox import get_sandbox
+
+        get_sandbox().start()
+
+
+def _decode_text(raw: bytes) -> str:
+    try:
+        return raw.decode("utf-8", errors="ignore")
+    except Exception:
+        # as fallback, return repr
+        return raw.decode("latin-1", errors="ignore")
+
+
+class _PartialParse(Exception):
+    """Raised out of the cached parser so a cut-short sandbox result is returned but never cached."""
+
+    def __init__(self, result: dict):
+        super().__init__(result["status"])
+        self.result = result
+
+
+def _extract_text(filename: str, raw: bytes) -> tuple[str, str]:
+    """(text, status); status is "ok" or the sandbox's "timeout" / "memory" / "crashed"."""
+    if ISOLATED_PARSING and filename.endswith((".pdf", ".docx")):
+        from parse_sandbox import parse_isolated
+
+        result = parse_isolated(raw, "pdf" if filename.endswith(".pdf") else "docx")
+        if result["status"] == "error":
+            # Same as an in-process parser exception: plain-decode fallback below
+            raise ValueError("sandboxed parse failed")
+        return result["text"], result["status"]
+    if filename.endswith(".pdf"):
+        return extract_text_from_pdf(raw), "ok"
+    if filename.endswith(".docx"):
+        return extract_text_from_docx(raw), "ok"
+    return _decode_text(raw), "ok"
+
+
+@st.cache_data(max_entries=RESUME_CACHE_ENTRIES, show_spinner=False)
+def _parse_resume(digest: str, filename: str, _raw: bytes) -> dict:
     """
-    Very simple text extractor for Streamlit uploaded file.
-    - For .txt: decode bytes
-    - For .pdf/.docx: you can improve later with PyPDF2 / docx2txt
+    Parsed resume, cached across reruns and sessions. Keyed on the SHA-256
+    of the file bytes (the underscore keeps Streamlit from hashing _raw
+    again); least recently used entries are evicted. Sandboxed parses that
+    timed out, hit the memory ceiling or crashed are not cached.
     """
+    from resume_doc import get_resume_doc
+
+    try:
+        text, status = _extract_text(filename, _raw)
+    except Exception:
+        # e.g. legacy .doc files or broken PDFs: best-effort plain decode
+        text, status = _decode_text(_raw), "ok"
+    result = {
+        "sha256": digest,
+        "text": text,
+        "status": status,
+        "contacts": extract_contact_info(text),
+        # Primes the shared ResumeDoc that the Home search reuses
+        "skills": sorted(get_resume_doc(text).skills),
+    }
+    if status != "ok":
+        raise _PartialParse(result)
+    return result
+
+
+def parse_uploaded_resume(uploaded_file) -> dict:
+    """Text, contact info and skills for a Streamlit upload; repeat uploads cost one hash."""
     if uploaded_file is None:
-        return ""
+        return {"sha256": "", "text": "", "status": "ok", "contacts": {}, "skills": []}
 
-    filename = uploaded_file.name.lower()
+    raw = uploaded_file.getvalue()
+    digest = hashlib.sha256(raw).hexdigest()
+    try:
+        return _parse_resume(digest, uploaded_file.name.lower(), raw)
+    except _PartialParse as e:
+        return e.result
 
-    # txt
-    if filename.endswith(".txt"):
-        return uploaded_file.read().decode("utf-8", errors="ignore")
 
-    # naive pdf/docx handling (you should replace with proper libs later)
+def extract_text_from_uploaded_file(uploaded_file) -> str:
+    """
+    Text extractor for a Streamlit uploaded file: PDF and DOCX go through
+    resume_parser, everything else is decoded as text. Results are cached
+    by content hash (see parse_uploaded_resume).
+    """
     try:
-        raw = uploaded_file.read()
-        try:
-            return raw.decode("utf-8", errors="ignore")
-        except Exception:
-            # as fallback, return repr
-            return raw.decode("latin-1", errors="ignore")
+        return parse_uploaded_resume(uploaded_file)["text"]
     except Exception as e:
         st.error(f"Failed to read file: {e}")
         return ""
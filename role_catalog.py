@@ -0,0 +1,148 @@
+import json
+import os
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+ROLES_FILE = os.getenv("ROLES_FILE", "roles.json")
+
+# Points per skill: a matched required skill is worth +7 and a missing one
+# -2 (the original match_jobs_with_gpt rule), a matched optional skill +3.
+# Folded into one weight matrix: 7m - 2(n - m) = 9m - 2n.
+W_REQUIRED_HIT = 7.0
+W_REQUIRED_MISS = 2.0
+W_OPTIONAL_HIT = 3.0
+
+# Semantic mode: blend of skill overlap and resume/role embedding similarity (both 0..100)
+ROLE_W_SKILL = 0.5
+ROLE_W_SEM = 0.5
+
+
+class RoleCatalog:
+    """
+    Job roles with required / optional skills, compiled at load time into a
+    role x skill weight matrix. Scoring every role against a resume is then
+    a single mat-vec product over the resume's skill vector; only the top-k
+    rows are decoded back into skill names.
+    In semantic mode roles are also ranked by the cosine similarity of the
+    resume embedding to the role descriptions, embedded once per catalog.
+    """
+
+    def __init__(self, roles: List[Dict]):
+        self.titles: List[str] = []
+        self.descriptions: List[str] = []
+        self.skills: List[str] = []
+        self._col: Dict[str, int] = {}
+        required_cols: List[List[int]] = []
+        optional_cols: List[List[int]] = []
+        for role in roles:
+            title = (role.get("title") or "").strip()
+            if not title:
+                continue
+            req = [self._column(s) for s in role.get("required") or [] if s]
+            opt = [self._column(s) for s in role.get("optional") or [] if s]
+            self.titles.append(title)
+            self.descriptions.append(self._describe(title, role))
+            required_cols.append(sorted(set(req)))
+            optional_cols.append(sorted(set(opt) - set(req)))
+
+        self.required = np.zeros((len(self.titles), len(self.skills)), dtype=np.float32)
+        self.optional = np.zeros_like(self.required)
+        for i, (req, opt) in enumerate(zip(required_cols, optional_cols)):
+            self.required[i, req] = 1.0
+            self.optional[i, opt] = 1.0
+        self.weights = (W_REQUIRED_HIT + W_REQUIRED_MISS) * self.required + W_OPTIONAL_HIT * self.optional
+        self.penalty = W_REQUIRED_MISS * self.required.sum(axis=1)
+        self._n_required = self.required.sum(axis=1)
+        self._embeddings: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    @staticmethod
+    def _describe(title: str, role: Dict) -> str:
+        # Text embedded for semantic matching: title, description and skills
+        skills = ", ".join((role.get("required") or []) + (role.get("optional") or []))
+        return f"{title}. {role.get('description') or ''}\nSkills: {skills}"
+
+    def _column(self, skill: str) -> int:
+        key = skill.strip().lower()
+        if key not in self._col:
+            self._col[key] = len(self.skills)
+            self.skills.append(skill.strip())
+        return self._col[key]
+
+    def skill_vector(self, skills: Iterable[str]) -> np.ndarray:
+        """0/1 float32 vector over the catalog's skills; unknown skills are ignored."""
+        vec = np.zeros(len(self.skills), dtype=np.float32)
+        cols = [self._col[k] for k in (s.lower() for s in skills) if k in self._col]
+        vec[cols] = 1.0
+        return vec
+
+    def score(self, skill_vec: np.ndarray) -> np.ndarray:
+        """Raw points for every role (see W_* above), one mat-vec product."""
+        return self.weights @ skill_vec - self.penalty
+
+    def top_roles(self, skill_vec: np.ndarray, k: int = 5) -> List[Tuple[int, float]]:
+        """(row, points) of the k best roles, best first; ties keep catalog order."""
+        scores = self.score(skill_vec)
+        order = np.argsort(-scores, kind="stable")[:k]
+        return [(int(i), float(scores[i])) for i in order]
+
+    def overlap_pct(self, skill_vec: np.ndarray) -> np.ndarray:
+        """
+        Skill overlap (0..100) per role: required coverage, with matched
+        optional skills counted at half weight (they can only raise it).
+        """
+        req_hits = self.required @ skill_vec
+        opt_hits = 0.5 * (self.optional @ skill_vec)
+        denom = self._n_required + opt_hits
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(denom > 0, 100.0 * (req_hits + opt_hits) / np.maximum(denom, 1e-9), 0.0)
+
+    def embeddings(self) -> np.ndarray:
+        """(roles, dim) normalized description embeddings, encoded on first use only."""
+        if self._embeddings is None:
+            from matcher import encode_texts
+
+            self._embeddings = encode_texts(self.descriptions)
+        return self._embeddings
+
+    def semantic_roles(self, resume_vec: np.ndarray, skill_vec: np.ndarray, k: int = 5,
+                       w_skill: float = ROLE_W_SKILL, w_sem: float = ROLE_W_SEM) -> List[Tuple[int, float]]:
+        """(row, blended 0..100 score) of the k best roles by embedding similarity + skill overlap."""
+        semantic = np.clip((self.embeddings() @ resume_vec + 1) * 50.0, 0.0, 100.0)
+        blended = w_skill * self.overlap_pct(skill_vec) + w_sem * semantic
+        order = np.argsort(-blended, kind="stable")[:k]
+        return [(int(i), float(blended[i])) for i in order]
+
+    def breakdown(self, row: int, skills: Iterable[str]) -> Tuple[List[str], List[str]]:
+        """(matched, missing) skill names for one role; missing only counts required skills."""
+        have = self.skill_vector(skills) > 0
+        req = self.required[row] > 0
+        opt = self.optional[row] > 0
+        matched = sorted(self.skills[c] for c in np.flatnonzero((req | opt) & have))
+        missing = sorted(self.skills[c] for c in np.flatnonzero(req & ~have))
+        return matched, missing
+
+
+def load_roles(path: str = ROLES_FILE) -> List[Dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    # Accept a bare list or {"roles": [...]}
+    if isinstance(data, dict):
+        data = data.get("roles", [])
+    return [r for r in data if isinstance(r, dict)]
+
+
+@lru_cache(maxsize=4)
+def _catalog(path: str, mtime: float) -> RoleCatalog:
+    return RoleCatalog(load_roles(path))
+
+
+def get_role_catalog(path: str = ROLES_FILE) -> RoleCatalog:
+    """Compiled catalog, rebuilt only when the file's mtime changes."""
+    if not os.path.exists(path):
+        return RoleCatalog([])
+    return _catalog(path, os.path.getmtime(path))
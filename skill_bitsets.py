@@ -0,0 +1,115 @@
+import hashlib
+import os
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from skill_matcher import compile_skills, load_skills
+from skill_taxonomy import SkillTaxonomy, get_taxonomy
+
+SKILL_BITS_KEY = "skill_bits"
+
+def popcount(a: np.ndarray) -> np.ndarray:
+    """Set bits per uint64 word."""
+    if hasattr(np, "bitwise_count"):  # numpy >= 2.0
+        return np.bitwise_count(a)
+    bytes_ = a.view(np.uint8).reshape(a.shape + (8,))
+    return np.unpackbits(bytes_, axis=-1).sum(axis=-1)
+
+class SkillVocabulary:
+    """
+    Fixed ordering of the skills.json vocabulary; a skill set is a packed
+    bitset of ceil(V/64) uint64 words. `fingerprint` changes whenever the
+    vocabulary or the alias taxonomy does, so stale per-job bitsets can be
+    detected.
+    """
+
+    def __init__(self, skills: List[str], taxonomy: Optional[SkillTaxonomy] = None):
+        self.skills: List[str] = list(dict.fromkeys(s.lower() for s in skills if s))
+        self.index: Dict[str, int] = {s: i for i, s in enumerate(self.skills)}
+        self.words = max(1, (len(self.skills) + 63) // 64)
+        self.taxonomy = taxonomy
+        key = "\n".join(self.skills) + (f"\n#{taxonomy.fingerprint}" if taxonomy is not None else "")
+        self.fingerprint = hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+
+    def _lookup(self, skill: str) -> Optional[int]:
+        # Exact vocabulary name first, then any taxonomy alias of it ("REST APIs" -> "rest api")
+        i = self.index.get((skill or "").lower())
+        if i is None and self.taxonomy is not None and skill:
+            for phrase in self.taxonomy.phrases_for(skill):
+                i = self.index.get(phrase.lower())
+                if i is not None:
+                    break
+        return i
+
+    def encode(self, skills: Iterable[str]) -> np.ndarray:
+        bits = np.zeros(self.words, dtype=np.uint64)
+        for s in skills:
+            i = self._lookup(s)
+            if i is not None:
+                bits[i >> 6] |= np.uint64(1) << np.uint64(i & 63)
+        return bits
+
+    def decode(self, bits: np.ndarray) -> List[str]:
+        flags = np.unpackbits(np.asarray(bits, dtype=np.uint64).view(np.uint8), bitorder="little")
+        return [self.skills[i] for i in np.flatnonzero(flags[:len(self.skills)])]
+
+    def extract(self, text: str) -> np.ndarray:
+        """Whole-token vocabulary skills (aliases included) in text, as a bitset (one trie pass)."""
+        return self.encode(compile_skills(tuple(self.skills), self.taxonomy).find((text or "").lower()))
+
+    def to_hex(self, bits: np.ndarray) -> str:
+        return bits.astype("<u8").tobytes().hex()
+
+    def from_hex(self, value: str) -> np.ndarray:
+        return np.frombuffer(bytes.fromhex(value), dtype="<u8").astype(np.uint64)
+
+@lru_cache(maxsize=4)
+def _vocabulary(path: str, mtime: float, taxonomy: SkillTaxonomy) -> SkillVocabulary:
+    return SkillVocabulary(load_skills(path), taxonomy)
+
+def get_vocabulary(path: str = "skills.json") -> Optional[SkillVocabulary]:
+    if not os.path.exists(path):
+        return None
+    return _vocabulary(path, os.path.getmtime(path), get_taxonomy())
+
+def _job_text(job: Dict) -> str:
+    return f"{job.get('title', '') or ''}\n{job.get('description', '') or ''}"
+
+def _stored_bits(job: Dict, vocab: SkillVocabulary) -> Optional[np.ndarray]:
+    cached = job.get(SKILL_BITS_KEY)
+    if isinstance(cached, dict) and cached.get("v") == vocab.fingerprint:
+        return vocab.from_hex(cached["bits"])
+    return None
+
+def job_bits(job: Dict, vocab: SkillVocabulary) -> np.ndarray:
+    """The job's bitset: the stored one when current, else extracted (the job is not modified)."""
+    bits = _stored_bits(job, vocab)
+    return bits if bits is not None else vocab.extract(_job_text(job))
+
+def annotate_job(job: Dict, vocab: SkillVocabulary) -> np.ndarray:
+    """Attach (or refresh) job["skill_bits"] at ingest time and return the bitset."""
+    bits = _stored_bits(job, vocab)
+    if bits is None:
+        bits = vocab.extract(_job_text(job))
+        job[SKILL_BITS_KEY] = {"v": vocab.fingerprint, "bits": vocab.to_hex(bits)}
+    return bits
+
+def job_bit_matrix(jobs: List[Dict], vocab: SkillVocabulary) -> np.ndarray:
+    """
+    (N, words) uint64 matrix. Read-only: bitsets stored at ingest
+    (LocalJobStore / JobIndex) are reused, the rest are extracted on the
+    fly, so ranking never writes into (possibly shared, cached) job dicts.
+    """
+    if not jobs:
+        return np.zeros((0, vocab.words), dtype=np.uint64)
+    return np.vstack([job_bits(j, vocab) for j in jobs])
+
+def jaccard_pct(resume_bits: np.ndarray, job_bits: np.ndarray) -> np.ndarray:
+    """Skill Jaccard (0..100) of one resume bitset against N job bitsets, via popcount."""
+    inter = popcount(job_bits & resume_bits).sum(axis=-1)
+    union = popcount(job_bits | resume_bits).sum(axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        jacc = np.where(union > 0, inter / np.maximum(union, 1), 0.0)
+    return np.round(jacc * 100.0, 4)
@@ -1,7 +1,11 @@
 import json
 import re
-from typing import List, Set
-from rapidfuzz import fuzz
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Set, Tuple
+import numpy as np
+from rapidfuzz import fuzz, process
+
+from skill_taxonomy import SkillTaxonomy, TokenTrie, get_taxonomy
 
 def load_skills(path: str = "skills.json") -> List[str]:
     with open(path, "r", encoding="utf-8") as f:
@@ -16,24 +20,92 @@ def load_skills(path: str = "skills.json") -> List[str]:
         return [s.strip() for s in data.split(",") if s.strip()]
     return []
 
-def extract_skills_from_text(text: str, skills_list: List[str], fuzzy_cutoff: int = 85) -> List[str]:
+class SkillMatcher:
+    """
+    Whole-token matcher for a skills vocabulary. Each skill is also matched
+    under its skill-taxonomy aliases ("k8s" -> "kubernetes"); all phrases
+    live in one TokenTrie, so a text is scanned once however large the
+    vocabulary grows, and matches never start or end inside a token.
+    """
+
+    def __init__(self, skills_list: List[str], taxonomy: Optional[SkillTaxonomy] = None):
+        self.trie = TokenTrie()
+        for s in skills_list:
+            if not s or not s.strip():
+                continue
+            for phrase in taxonomy.phrases_for(s) if taxonomy is not None else [s]:
+                self.trie.add(phrase, s)
+
+    def find(self, text_lower: str) -> Set[str]:
+        return self.trie.find(text_lower)
+
+@lru_cache(maxsize=8)
+def compile_skills(skills: Tuple[str, ...], taxonomy: Optional[SkillTaxonomy] = None) -> SkillMatcher:
+    # Keyed on the taxonomy object too: get_taxonomy() hands out a new one when the file changes
+    return SkillMatcher(list(skills), taxonomy)
+
+TOKEN_RE = re.compile(r"\w[\w+#.\-]*")
+MAX_WINDOW_TOKENS = 6
+
+def tokenize_for_windows(text_lower: str) -> List[str]:
+    tokens = (t.rstrip(".-") for t in TOKEN_RE.findall(text_lower))
+    return [t for t in tokens if t]
+
+def token_ngrams(tokens: List[str], n: int) -> List[str]:
+    return [" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1)]
+
+def _candidate_windows(tokens: List[str], max_n: int, ngrams: Optional[Callable[[int], List[str]]] = None) -> List[str]:
+    # Every 1..max_n token n-gram of the text, deduplicated; ngrams lets a
+    # ResumeDoc hand over its memoized n-gram lists
+    ngrams = ngrams or (lambda n: token_ngrams(tokens, n))
+    windows: Dict[str, None] = {}
+    for n in range(1, max_n + 1):
+        windows.update(dict.fromkeys(ngrams(n)))
+    return list(windows)
+
+def fuzzy_match_skills(text_lower: str, skills_list: List[str], fuzzy_cutoff: int = 85, workers: int = 1,
+                       tokens: Optional[List[str]] = None,
+                       ngrams: Optional[Callable[[int], List[str]]] = None) -> Set[str]:
+    """
+    Score all skills against all candidate n-gram windows of the text in one
+    vectorized rapidfuzz cdist call. A skill matches when its best
+    ratio against any window is >= fuzzy_cutoff. Pre-tokenized text
+    (tokens, and optionally an ngrams(n) provider) skips re-tokenizing.
+    """
+    skills = [s for s in skills_list if s.strip()]
+    if not skills or not text_lower.strip():
+        return set()
+
+    # One extra token catches split spellings such as "postgre sql"
+    longest = max(len(s.split()) for s in skills)
+    if tokens is None:
+        tokens = tokenize_for_windows(text_lower)
+    windows = _candidate_windows(tokens, min(longest + 1, MAX_WINDOW_TOKENS), ngrams)
+    if not windows:
+        return set()
+
+    scores = process.cdist(
+        [s.lower() for s in skills],
+        windows,
+        scorer=fuzz.ratio,
+        score_cutoff=fuzzy_cutoff,
+        dtype=np.uint8,
+        workers=workers,
+    )
+    hits = (scores >= fuzzy_cutoff).any(axis=1)
+    return {s for s, hit in zip(skills, hits) if hit}
+
+def extract_skills_from_text(text: str, skills_list: List[str], fuzzy_cutoff: int = 85, workers: int = 1,
+                             tokens: Optional[List[str]] = None,
+                             ngrams: Optional[Callable[[int], List[str]]] = None) -> List[str]:
     text_lower = (text or "").lower()
-    found: Set[str] = set()
 
-    # Exact whole-word match first
-    for s in skills_list:
-        slow = s.lower()
-        pattern = r"\b" + re.escape(slow) + r"\b"
-        if re.search(pattern, text_lower):
-            found.add(s)
+    # Exact whole-token match first, aliases included (one trie pass, cached per vocabulary)
+    found: Set[str] = compile_skills(tuple(skills_list), get_taxonomy()).find(text_lower)
 
-    # Fuzzy if few found
+    # Fuzzy if few found; workers=-1 uses all cores for the cdist call
     if len(found) < 5:
-        for s in skills_list:
-            if s in found:
-                continue
-            score = fuzz.partial_ratio(s.lower(), text_lower)
-            if score >= fuzzy_cutoff:
-                found.add(s)
+        remaining = [s for s in skills_list if s not in found]
+        found |= fuzzy_match_skills(text_lower, remaining, fuzzy_cutoff, workers, tokens, ngrams)
 
     return sorted(found)
@@ -0,0 +1,145 @@
+import hashlib
+import json
+import os
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Set
+
+TAXONOMY_FILE = os.getenv("SKILL_TAXONOMY_FILE", "skill_taxonomy.json")
+
+# A token is a run of word chars that may carry + # . inside or after it
+# ("c++", "c#", "node.js", ".net"); trailing dots are sentence punctuation.
+# Everything else, including "-" and "/", separates tokens. Inside text, a
+# dotted token only stays whole if a trie phrase uses it (see TokenTrie.tokens).
+TOKEN_RE = re.compile(r"\.?\w[\w+#.]*")
+_END = ""  # trie key holding the values of the phrase ending at a node
+
+
+def tokenize(text: str) -> List[str]:
+    tokens = (t.rstrip(".") for t in TOKEN_RE.findall((text or "").lower()))
+    return [t for t in tokens if t]
+
+
+class TokenTrie:
+    """
+    Trie over token sequences. Since text and phrases are tokenized the same
+    way, a match always starts and ends on a token boundary: "java" never
+    fires inside "javascript", nor "node" inside "nodes".
+    Text extracted from PDFs often drops the space after a period
+    ("Python.Java"), so dotted text tokens the trie does not know are split
+    on their dots.
+    """
+
+    def __init__(self):
+        self._root: Dict[str, dict] = {}
+        self._dotted: Set[str] = set()
+
+    def add(self, phrase: str, value: str):
+        tokens = tokenize(phrase)
+        if not tokens:
+            return
+        self._dotted.update(t for t in tokens if "." in t)
+        node = self._root
+        for tok in tokens:
+            node = node.setdefault(tok, {})
+        node.setdefault(_END, set()).add(value)
+
+    def find_tokens(self, tokens: List[str]) -> Set[str]:
+        """Values of every phrase occurring in tokens, overlapping ones included."""
+        root = self._root
+        found: Set[str] = set()
+        for i in range(len(tokens)):
+            node = root.get(tokens[i])
+            j = i + 1
+            while node is not None:
+                values = node.get(_END)
+                if values:
+                    found |= values
+                if j == len(tokens):
+                    break
+                node = node.get(tokens[j])
+                j += 1
+        return found
+
+    def tokens(self, text: str) -> List[str]:
+        """tokenize(), with unknown dotted tokens split into their parts."""
+        out: List[str] = []
+        for tok in tokenize(text):
+            if "." in tok and tok not in self._dotted:
+                out.extend(p for p in tok.split(".") if p)
+            else:
+                out.append(tok)
+        return out
+
+    def find(self, text: str) -> Set[str]:
+        return self.find_tokens(self.tokens(text))
+
+
+class SkillTaxonomy:
+    """
+    Canonical skills with aliases and categories (skill_taxonomy.json),
+    compiled into a TokenTrie from every alias to its canonical name.
+    """
+
+    def __init__(self, entries: List[Dict]):
+        self.names: List[str] = []
+        self.categories: Dict[str, str] = {}
+        self.aliases: Dict[str, List[str]] = {}
+        self._canonical: Dict[str, str] = {}
+        self.trie = TokenTrie()
+        for entry in entries:
+            name = (entry.get("name") or "").strip()
+            if not name or name.lower() in self._canonical:
+                continue
+            phrases = [name] + [a.strip() for a in entry.get("aliases") or [] if a and a.strip()]
+            self.names.append(name)
+            self.categories[name] = entry.get("category") or ""
+            self.aliases[name] = phrases[1:]
+            for phrase in phrases:
+                self._canonical.setdefault(phrase.lower(), name)
+                self.trie.add(phrase, name)
+        self.fingerprint = hashlib.sha1(
+            json.dumps([[n] + self.aliases[n] for n in self.names]).encode("utf-8")
+        ).hexdigest()[:12]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def canonical(self, skill: str) -> Optional[str]:
+        """Canonical name for a canonical name or alias (case-insensitive)."""
+        return self._canonical.get((skill or "").strip().lower())
+
+    def phrases_for(self, skill: str) -> List[str]:
+        """The skill itself plus the aliases of its taxonomy entry, if any."""
+        name = self.canonical(skill)
+        if name is None:
+            return [skill]
+        return list(dict.fromkeys([skill, name] + self.aliases[name]))
+
+    def find(self, text: str) -> Set[str]:
+        """Canonical names of all skills mentioned in text, in one trie pass."""
+        return self.trie.find(text)
+
+
+def load_taxonomy(path: str = TAXONOMY_FILE) -> List[Dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    # Accept a bare list or {"skills": [...]}
+    if isinstance(data, dict):
+        data = data.get("skills", [])
+    return [e for e in data if isinstance(e, dict)]
+
+
+@lru_cache(maxsize=4)
+def _taxonomy(path: str, mtime: float) -> SkillTaxonomy:
+    return SkillTaxonomy(load_taxonomy(path))
+
+
+def get_taxonomy(path: str = TAXONOMY_FILE) -> SkillTaxonomy:
+    """Compiled taxonomy, recompiled only when the file's mtime changes."""
+    if not os.path.exists(path):
+        return _EMPTY
+    return _taxonomy(path, os.path.getmtime(path))
+
+
+_EMPTY = SkillTaxonomy([])
@@ -0,0 +1,90 @@
+"""
+Import-cost report for every Streamlit page.
+
+    python startup_report.py            # all pages/*.py
+    python startup_report.py Home --top 10
+
+Each page is imported (not run) in a fresh interpreter under
+`python -X importtime`, so the numbers are what a cold server process pays
+the first time that page is opened.
+"""
+import argparse
+import json
+import pathlib
+import subprocess
+import sys
+from typing import Dict, List
+
+ROOT = pathlib.Path(__file__).resolve().parent
+MARKER = "--startup-report-page--"
+
+_PAGE_IMPORTER = f"""
+import importlib.util, sys, time
+sys.path.insert(0, ".")
+sys.stderr.write("{MARKER}\\n")
+t0 = time.perf_counter()
+spec = importlib.util.spec_from_file_location("_startup_report_page", sys.argv[1])
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+print(time.perf_counter() - t0)
+"""
+
+def _parse_importtime(stderr: str) -> List[Dict]:
+    lines = stderr.split(MARKER, 1)[-1].splitlines()
+    entries = []
+    for line in lines:
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        name = parts[2].rstrip()
+        entries.append({
+            "module": name.strip(),
+            "depth": (len(name) - len(name.lstrip())) // 2,
+            "self_ms": int(parts[0]) / 1000.0,
+            "cumulative_ms": int(parts[1]) / 1000.0,
+        })
+    if not entries:
+        return []
+    top = min(e["depth"] for e in entries)
+    return [e for e in entries if e["depth"] == top]
+
+def measure_page(path: pathlib.Path) -> Dict:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PAGE_IMPORTER, str(path)],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    report = {"page": path.stem, "ok": proc.returncode == 0, "total_ms": None, "imports": []}
+    if proc.returncode == 0:
+        report["total_ms"] = float(proc.stdout.strip().splitlines()[-1]) * 1000.0
+    else:
+        report["error"] = (proc.stderr.strip().splitlines() or ["unknown error"])[-1]
+    report["imports"] = sorted(_parse_importtime(proc.stderr), key=lambda e: e["cumulative_ms"], reverse=True)
+    return report
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("pages", nargs="*", help="page names (default: all pages)")
+    ap.add_argument("--top", type=int, default=5, help="heaviest top-level imports to list per page")
+    ap.add_argument("--json", action="store_true", help="print machine-readable JSON")
+    args = ap.parse_args()
+
+    paths = sorted((ROOT / "pages").glob("*.py"))
+    if args.pages:
+        wanted = {p.lower() for p in args.pages}
+        paths = [p for p in paths if p.stem.lower() in wanted]
+
+    reports = [measure_page(p) for p in paths]
+    if args.json:
+        print(json.dumps(reports, indent=2))
+        return
+
+    for r in sorted(reports, key=lambda r: r["total_ms"] or 0.0, reverse=True):
+        total = f"{r['total_ms']:.1f} ms" if r["ok"] else f"FAILED ({r['error']})"
+        print(f"{r['page']:<20} {total}")
+        for e in r["imports"][:args.top]:
+            print(f"    {e['cumulative_ms']:>9.1f} ms  {e['module']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+from resume_doc import ResumeDoc
+
+RESUME = """Jane Doe
+jane@example.com | +1 555 0100
+
+Professional Summary
+Backend engineer with 6 years of Python.
+
+Technical Skills:
+Python, Django, PostgreSQL, Docker
+
+Work Experience
+Acme Corp - Senior Engineer
+Built the billing service.
+
+Education
+B.Sc. Computer Science
+"""
+
+
+def test_sections_split_on_headings():
+    doc = ResumeDoc(RESUME)
+    assert doc.sections == {
+        "header": "Jane Doe\njane@example.com | +1 555 0100",
+        "summary": "Backend engineer with 6 years of Python.",
+        "skills": "Python, Django, PostgreSQL, Docker",
+        "experience": "Acme Corp - Senior Engineer\nBuilt the billing service.",
+        "education": "B.Sc. Computer Science",
+    }
+    assert doc.sections is doc.sections
+
+
+def test_sections_without_headings_is_all_header():
+    assert ResumeDoc("just some text\nmore").sections == {"header": "just some text\nmore"}
+
+
+def test_excerpt_keeps_short_text_whole():
+    doc = ResumeDoc(RESUME)
+    assert doc.excerpt(3000) == doc.text
+
+
+def test_excerpt_packs_sections_when_text_is_long():
+    doc = ResumeDoc(("filler " * 400) + "\n" + RESUME)
+    out = doc.excerpt(300)
+    assert len(out) <= 300
+    assert out.startswith("Skills:\nPython, Django, PostgreSQL, Docker\n\nExperience:\nAcme Corp")
+    assert "filler" not in out
+
+
+def test_excerpt_without_sections_is_a_word_boundary_prefix():
+    doc = ResumeDoc("word " * 1000)
+    out = doc.excerpt(101)
+    assert len(out) <= 101 and not out.endswith(" wor")
+    assert doc.text.startswith(out)
@@ -0,0 +1,138 @@
+import hashlib
+import json
+import os
+import pathlib
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Query params that must never reach fixture files or their keys
+SECRET_PARAMS = {"app_id", "app_key"}
+
+def fixture_key(url: str, params: Optional[Dict] = None) -> str:
+    public = {k: v for k, v in (params or {}).items() if k not in SECRET_PARAMS}
+    blob = json.dumps([url, sorted((str(k), str(v)) for k, v in public.items())])
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:32]
+
+class FixtureResponse:
+    """Minimal stand-in for requests.Response built from a fixture file."""
+
+    def __init__(self, url: str, status_code: int, body):
+        self.url = url
+        self.status_code = status_code
+        self._body = body
+
+    def json(self):
+        return self._body
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+class LiveTransport:
+    """Real HTTP over one keep-alive session shared by all threads."""
+
+    def __init__(self):
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=32)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def get(self, url: str, params: Optional[Dict] = None, timeout: float = 20):
+        return self.session.get(url, params=params, timeout=timeout)
+
+class RecordingTransport:
+    """Live requests whose responses are also written to `fixtures_dir` (credentials stripped)."""
+
+    def __init__(self, fixtures_dir: str, inner: Optional[LiveTransport] = None):
+        self.dir = pathlib.Path(fixtures_dir)
+        self.inner = inner or LiveTransport()
+        self._lock = threading.Lock()
+
+    def get(self, url: str, params: Optional[Dict] = None, timeout: float = 20):
+        r = self.inner.get(url, params=params, timeout=timeout)
+        try:
+            body = r.json()
+        except ValueError:
+            return r
+        fixture = {
+            "url": url,
+            "params": {k: v for k, v in (params or {}).items() if k not in SECRET_PARAMS},
+            "status": r.status_code,
+            "body": body,
+        }
+        with self._lock:
+            self.dir.mkdir(parents=True, exist_ok=True)
+            path = self.dir / f"{fixture_key(url, params)}.json"
+            path.write_text(json.dumps(fixture), encoding="utf-8")
+        return r
+
+class ReplayTransport:
+    """
+    Serves recorded fixtures without network access. Latency and failures
+    are injected from a seeded RNG so load tests are reproducible:
+    - latency: callable(rng) -> seconds; default lognormal around latency_ms
+    - error_rate: share of calls answered with `error_status`
+    - timeout_rate: share of calls that raise requests.Timeout after `timeout`
+    Unrecorded requests get a 404 fixture response.
+    """
+
+    def __init__(self, fixtures_dir: str, latency_ms: float = 0.0, latency_sigma: float = 0.5,
+                 latency: Optional[Callable[[random.Random], float]] = None,
+                 error_rate: float = 0.0, error_status: int = 503, timeout_rate: float = 0.0,
+                 seed: int = 0):
+        self.dir = pathlib.Path(fixtures_dir)
+        self.latency = latency or (
+            lambda rng: rng.lognormvariate(0.0, latency_sigma) * latency_ms / 1000.0 if latency_ms else 0.0
+        )
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.timeout_rate = timeout_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._cache: Dict[str, Dict] = {}
+
+    def _load(self, key: str) -> Optional[Dict]:
+        if key not in self._cache:
+            path = self.dir / f"{key}.json"
+            if not path.exists():
+                return None
+            self._cache[key] = json.loads(path.read_text(encoding="utf-8"))
+        return self._cache[key]
+
+    def get(self, url: str, params: Optional[Dict] = None, timeout: float = 20):
+        with self._lock:
+            delay = self.latency(self._rng)
+            roll = self._rng.random()
+            fixture = self._load(fixture_key(url, params))
+        if roll < self.timeout_rate:
+            time.sleep(timeout)
+            raise requests.Timeout(f"replay: injected timeout for {url}")
+        time.sleep(min(delay, timeout))
+        if delay > timeout:
+            raise requests.Timeout(f"replay: latency {delay:.2f}s exceeded timeout for {url}")
+        if roll < self.timeout_rate + self.error_rate:
+            return FixtureResponse(url, self.error_status, {})
+        if fixture is None:
+            return FixtureResponse(url, 404, {"error": "no fixture recorded"})
+        return FixtureResponse(url, fixture["status"], fixture["body"])
+
+def transport_from_env():
+    """JOBS_TRANSPORT=live|record|replay, fixtures under JOBS_FIXTURES_DIR."""
+    mode = os.getenv("JOBS_TRANSPORT", "live").lower()
+    fixtures = os.getenv("JOBS_FIXTURES_DIR", "fixtures/http")
+    if mode == "record":
+        return RecordingTransport(fixtures)
+    if mode == "replay":
+        return ReplayTransport(
+            fixtures,
+            latency_ms=float(os.getenv("JOBS_REPLAY_LATENCY_MS", "0")),
+            error_rate=float(os.getenv("JOBS_REPLAY_ERROR_RATE", "0")),
+            timeout_rate=float(os.getenv("JOBS_REPLAY_TIMEOUT_RATE", "0")),
+            seed=int(os.getenv("JOBS_REPLAY_SEED", "0")),
+        )
+    return LiveTransport()